@@ -29,27 +29,27 @@
 # SOFTWARE.
 #
 
-import json
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from loaders.load_iso_639 import load_iso_639
-from loaders.load_cldr_likely_subtags import load_cldr_likely_subtags
-from loaders.load_wiktionary_languages import load_wiktionary_languages
-from loaders.load_uralic_languages import load_uralic_languages
-from loaders.load_written_languages import load_written_languages
-from loaders.load_glottolog import load_glottolog
-from loaders.load_pos_stats import load_pos_stats
+from loaders.load_sources import load_all_sources, format_timings, sources_for_fields
+from loaders.source_streams import SOURCE_STREAMS, SortedCursor, iter_sorted_stream, prepare_stream
 
 from logic.decide_default_script import decide_default_script
 from logic.decide_default_region import decide_default_region
 from logic.build_bcp47 import build_bcp47
+from logic.batch_decisions import decide_columns, parse_cldr
 from logic.decide_fallback import decide_fallback
 from logic.is_uralic import is_uralic
-from logic.set_uralic_langs import set_uralic_langs
+from logic.build_context import BuildContext, URALIC
 
 from models.language import Language
 
+from writers.unified_writers import WRITERS, COMPRESSORS, open_writer
+
 # ---------------------------------------------------------
 # OUTPUT-kansiot
 # ---------------------------------------------------------
@@ -62,106 +62,366 @@ for folder in SUBFOLDERS:
     (OUTPUT_ROOT / folder).mkdir(parents=True, exist_ok=True)
 
 OUTPUT = OUTPUT_ROOT / "unified" / "unified_languages.json"
+# Osittaisen buildin (--fields) oletustuloste; ei korvaa täyttä tietokantaa
+OUTPUT_PROJECTED = OUTPUT_ROOT / "unified" / "unified_projected.json"
+
+# ---------------------------------------------------------
+# Kenttien rakentajat
+# ---------------------------------------------------------
+#
+# Jokainen Language-kenttä lasketaan omalla funktiollaan, jotta osittainen
+# build (--fields) voi laskea vain pyydetyt kentät. Kaikki saavat samat
+# argumentit: (lang_id, iso_info, context, decided), missä decided on
+# {"default_script", "default_region", "bcp47"} tälle kielelle.
+
+def _wikt(lang_id, context):
+    return context.source("wikt").get(lang_id, {})
+
+
+def _written(lang_id, context):
+    return context.source("written").get(lang_id, {})
+
+
+def _name(lang_id, iso_info, context, decided):
+    return _wikt(lang_id, context).get("name") or iso_info.get("name") or lang_id
+
+
+def _official_name(lang_id, iso_info, context, decided):
+    return _wikt(lang_id, context).get("official_name") or _name(lang_id, iso_info, context, decided)
+
+
+def _written_scripts(lang_id, iso_info, context, decided):
+    # Puhdista written_scripts ja lisää default_script tarvittaessa
+    script = decided["default_script"]
+    scripts = [s for s in _written(lang_id, context).get("scripts", []) if s and s.upper() != "UNKNOWN"]
+    if not scripts and script:
+        scripts = [script]
+    elif not scripts:
+        scripts = []
+    return scripts
+
+
+def _glottocode(lang_id, iso_info, context, decided):
+    return _written(lang_id, context).get("glottocode") or context.source("iso_to_glottocode").get(lang_id)
+
+
+FIELD_BUILDERS = {
+    "id": lambda lang_id, iso_info, context, decided: lang_id,
+    "name": _name,
+    "official_name": _official_name,
+    "iso639_1": lambda lang_id, iso_info, context, decided: iso_info.get("iso639_1", ""),
+    "iso639_2B": lambda lang_id, iso_info, context, decided: iso_info.get("iso639_2B", ""),
+    "iso639_2T": lambda lang_id, iso_info, context, decided: iso_info.get("iso639_2T", ""),
+    "iso639_3": lambda lang_id, iso_info, context, decided: iso_info.get("iso639_3", ""),
+    "iso639_5": lambda lang_id, iso_info, context, decided: iso_info.get("iso639_5", ""),
+    "default_script": lambda lang_id, iso_info, context, decided: decided["default_script"],
+    "default_region": lambda lang_id, iso_info, context, decided: decided["default_region"],
+    "bcp47": lambda lang_id, iso_info, context, decided: decided["bcp47"],
+    "fallback": lambda lang_id, iso_info, context, decided: decide_fallback(lang_id, _wikt(lang_id, context)),
+    "uralicNLP": lambda lang_id, iso_info, context, decided: is_uralic(lang_id, context),
+    "written": lambda lang_id, iso_info, context, decided: _written(lang_id, context).get("written", False),
+    "written_scripts": _written_scripts,
+    "glottocode": _glottocode,
+    "family": lambda lang_id, iso_info, context, decided: _written(lang_id, context).get("family"),
+    "glottolog": lambda lang_id, iso_info, context, decided: context.source("glottolog").get(lang_id, {}),
+    "pos_stats": lambda lang_id, iso_info, context, decided: context.source("pos_stats").get(lang_id, {}),
+}
+
+# Kentät, jotka tarvitsevat skripti/alue/BCP-47 -päätökset
+DECISION_FIELDS = {"default_script", "default_region", "bcp47", "written_scripts"}
+
+
+def _decide_scalar(lang_id, iso_info, context):
+    w = _wikt(lang_id, context)
+    cldr = context.source("cldr")
+    script = decide_default_script(lang_id, w, cldr, _written(lang_id, context), iso_info, context)
+    region = decide_default_region(lang_id, w, cldr, iso_info, context)
+    return {
+        "default_script": script,
+        "default_region": region,
+        "bcp47": build_bcp47(lang_id, script, region, iso_info),
+    }
+
+
+# ---------------------------------------------------------
+# Yhden kielen rakentaminen
+# ---------------------------------------------------------
+
+def build_language(lang_id: str, iso_info: Dict[str, Any], context: BuildContext,
+                   decided=None, fields=None) -> Dict[str, Any]:
+    """
+    Rakentaa yhden kielen unified-tietueen. context.sources sisältää
+    lähdetaulut (cldr, wikt, written, glottolog, iso_to_glottocode, pos_stats).
+    decided = {"default_script", "default_region", "bcp47"} valmiiksi
+    laskettuna eräpolulta; muuten päätökset tehdään skalaarifunktioilla.
+    fields = vain nämä kentät (projektio); None → koko Language-olio.
+    """
+    if fields is None:
+        if decided is None:
+            decided = _decide_scalar(lang_id, iso_info, context)
+        values = {name: build(lang_id, iso_info, context, decided) for name, build in FIELD_BUILDERS.items()}
+        return Language(**values).__dict__
+
+    if decided is None and DECISION_FIELDS & set(fields):
+        decided = _decide_scalar(lang_id, iso_info, context)
+    return {name: FIELD_BUILDERS[name](lang_id, iso_info, context, decided) for name in fields}
+
+
+# ---------------------------------------------------------
+# Osioitu rinnakkaisrakennus
+# ---------------------------------------------------------
+
+# Työprosessin konteksti. Asetetaan vain työprosesseissa _init_worker():ssa;
+# pääprosessi välittää kontekstin initargs-parametrina, joten samanaikaiset
+# rakennukset eivät jaa tilaa.
+_WORKER_CONTEXT: Optional[BuildContext] = None
+
+# Kielten määrä yhdessä osiossa (pienempi → tasaisempi kuorma)
+CHUNK_SIZE = 1000
+
+
+def build_languages(items, context, fields=None):
+    """
+    Rakentaa listan (lang_id, iso_info) -pareja. Skripti, alue ja BCP-47
+    päätetään sarakkeittain yhdellä decide_columns-kutsulla, ja vain jos
+    jokin pyydetyistä kentistä tarvitsee niitä.
+    """
+    if fields is not None and not DECISION_FIELDS & set(fields):
+        return [(lang_id, build_language(lang_id, iso_info, context, None, fields)) for lang_id, iso_info in items]
+
+    lang_ids = [lang_id for lang_id, _ in items]
+    iso_rows = [iso_info for _, iso_info in items]
+    wikt, written = context.source("wikt"), context.source("written")
+
+    columns = decide_columns(
+        lang_ids,
+        iso_rows,
+        [wikt.get(lang_id, {}) for lang_id in lang_ids],
+        [written.get(lang_id, {}) for lang_id in lang_ids],
+        context.source("cldr"),
+        parsed_cldr=context.sources.get("cldr_parsed"),
+        context=context,
+    )
+    decided = (
+        {"default_script": script, "default_region": region, "bcp47": bcp47}
+        for script, region, bcp47 in zip(columns["default_script"], columns["default_region"], columns["bcp47"])
+    )
+
+    return [
+        (lang_id, build_language(lang_id, iso_info, context, d, fields))
+        for (lang_id, iso_info), d in zip(items, decided)
+    ]
+
+
+def _init_worker(context):
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+
+
+def _build_chunk(items, fields):
+    return build_languages(items, _WORKER_CONTEXT, fields)
+
+
+def _iter_partitioned(iso, context, workers, fields=None):
+    items = list(iso.items())
+    chunks = [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+
+    # fork: initargs periytyy lapselle copy-on-write -sivuina ilman picklausta;
+    # muissa käynnistystavoissa konteksti picklataan kerran työprosessia kohden
+    mp_context = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                               initializer=_init_worker, initargs=(context,))
+
+    with pool:
+        # map() palauttaa osiot syötteen järjestyksessä → sama avainjärjestys
+        # kuin sarjapolulla, joten tuloste on tavulleen identtinen
+        for chunk in pool.map(_build_chunk, chunks, [fields] * len(chunks)):
+            yield from chunk
+
 
 # ---------------------------------------------------------
 # Unified-rakenteen rakentaminen
 # ---------------------------------------------------------
 
-def build_unified() -> Dict[str, Any]:
+def parse_fields(text):
+    """"bcp47,fallback" → kenttälista Language-järjestyksessä (ValueError tuntemattomista)."""
+    wanted = {f.strip() for f in text.split(",") if f.strip()}
+    unknown = sorted(wanted - set(FIELD_BUILDERS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return [name for name in FIELD_BUILDERS if name in wanted]
+
+
+def build_unified(workers: int = 1, fields=None) -> Dict[str, Any]:
+    """
+    fields=None → täysi build. Muuten ladataan vain ne lähteet, joita
+    pyydetyt kentät tarvitsevat, ja palautetaan projektio
+    {lang_id: {kenttä: arvo}}.
+    """
+    iso, context = prepare_build(fields)
+    return build_from_context(iso, context, workers, fields)
 
-    # --- Lataa datalähteet ---
-    iso = load_iso_639()
-    cldr = load_cldr_likely_subtags()
-    wikt = load_wiktionary_languages()
-    written = load_written_languages()
-    uralic_set = load_uralic_languages()
-    glottolog = load_glottolog()
-    pos_stats = load_pos_stats()
+
+def prepare_build(fields=None):
+    """Lataa pyydettyjen kenttien lähteet. Palauttaa (iso, context)."""
+
+    # --- Lataa datalähteet (rinnakkain) ---
+    sources, timings = load_all_sources(sources_for_fields(fields))
+    print(format_timings(timings))
+
+    iso = sources["iso"]
+    uralic_set = sources.get("uralic")
+    cldr = sources.get("cldr", {})
+
+    context = BuildContext.create(
+        sources={
+            "cldr": cldr,
+            "cldr_parsed": parse_cldr(cldr),
+            "wikt": sources.get("wikt", {}),
+            "written": sources.get("written", {}),
+            "glottolog": sources.get("glottolog", {}),
+            "iso_to_glottocode": sources.get("crosswalk", {}).get("iso_to_glottocode", {}),
+            "pos_stats": sources.get("pos_stats", {}),
+        },
+        families={URALIC: uralic_set or ()},
+    )
 
     # --- Check uralic_languages.json ---
-    if not uralic_set:
+    if uralic_set is not None and not uralic_set:
         print("Warning: uralic.json missing or empty. All languages will have uralicNLP=False")
 
-    # Aseta uralilaiset kielet logic-moduulille
-    set_uralic_langs(uralic_set)
-
-    unified: Dict[str, Any] = {}
-
-    # --- Käy läpi kaikki ISO-kielet ---
-    for lang_id, iso_info in iso.items():
-
-        w = wikt.get(lang_id, {})
-        w_written = written.get(lang_id, {})
-        glotto = glottolog.get(lang_id, {})
-        pos = pos_stats.get(lang_id, {})
-
-        # Nimet
-        name = w.get("name") or iso_info.get("name") or lang_id
-        official_name = w.get("official_name") or name
-
-        # ISO-koodit
-        iso1 = iso_info.get("iso639_1", "")
-        iso2B = iso_info.get("iso639_2B", "")
-        iso2T = iso_info.get("iso639_2T", "")
-        iso3 = iso_info.get("iso639_3", "")
-        iso5 = iso_info.get("iso639_5", "")
-
-        # --- Skripti ja alue ---
-        script = decide_default_script(lang_id, w, cldr, w_written, iso_info)
-        region = decide_default_region(lang_id, w, cldr, iso_info)
-
-        # --- BCP-47 ---
-        bcp47 = build_bcp47(lang_id, script, region, iso_info)
-
-        # --- Fallback ja Uralic-tuki ---
-        fallback = decide_fallback(lang_id, w)
-        uralic = is_uralic(lang_id)
-
-        # --- Puhdista written_scripts ja lisää default_script tarvittaessa ---
-        scripts = [s for s in w_written.get("scripts", []) if s and s.upper() != "UNKNOWN"]
-        if not scripts and script:
-            scripts = [script]
-        elif not scripts:
-            scripts = []
-
-        # Luo Language-olio
-        lang_obj = Language(
-            id=lang_id,
-            name=name,
-            official_name=official_name,
-            iso639_1=iso1,
-            iso639_2B=iso2B,
-            iso639_2T=iso2T,
-            iso639_3=iso3,
-            iso639_5=iso5,
-            default_script=script,
-            default_region=region,
-            bcp47=bcp47,
-            fallback=fallback,
-            uralicNLP=uralic,
-            written=w_written.get("written", False),
-            written_scripts=scripts,
-            glottocode=w_written.get("glottocode"),
-            family=w_written.get("family"),
-            glottolog=glotto,
-            pos_stats=pos,
-        )
-
-        unified[lang_id] = lang_obj.__dict__
-
-    return unified
+    return iso, context
+
+
+def build_from_context(iso: Dict[str, Any], context: BuildContext, workers: int = 1,
+                       fields=None) -> Dict[str, Any]:
+    """
+    Rakentaa unified-rakenteen annetuilla ISO-kielillä ja kontekstilla.
+    Ei käytä globaalia tilaa, joten useita buildeja (esim. pelkkä
+    uralilainen osajoukko ja täysi build) voi ajaa rinnakkain säikeissä.
+    """
+    return dict(iter_unified_records(iso, context, workers, fields))
+
+
+def iter_unified_records(iso: Dict[str, Any], context: BuildContext, workers: int = 1, fields=None):
+    """
+    Tuottaa (lang_id, tietue) -parit ISO-järjestyksessä osio kerrallaan,
+    jotta kirjoitin voi tallentaa ne sitä mukaa kuin ne valmistuvat.
+    """
+    if workers > 1 and len(iso) > CHUNK_SIZE:
+        yield from _iter_partitioned(iso, context, workers, fields)
+        return
+
+    items = list(iso.items())
+    for i in range(0, len(items), CHUNK_SIZE):
+        yield from build_languages(items[i:i + CHUNK_SIZE], context, fields)
+
+# ---------------------------------------------------------
+# Virtaava build (sorted-merge join)
+# ---------------------------------------------------------
+
+def build_unified_streaming(output, fields=None, format=None, compression=None, index=True) -> int:
+    """
+    Muistirajattu build: suuret kielikohtaiset lähteet (SOURCE_STREAMS)
+    lajitellaan ID-järjestettyiksi JSONL-virroiksi, ja ISO-kielet käydään
+    läpi ID-järjestyksessä yhdistäen virrat merge joinilla. Jokainen
+    tietue kirjoitetaan heti tulosteeseen, joten muistissa on kerrallaan
+    vain yksi tietue ja pienet hakutaulut (ISO, CLDR, Uralic, crosswalk).
+
+    Tietueet ovat samat kuin build_unified():lla, mutta järjestys on
+    ID-järjestys ISO-lähteen järjestyksen sijaan. Palauttaa tietueiden määrän.
+    """
+    names = sources_for_fields(fields)
+    streamed = [name for name in names if name in SOURCE_STREAMS]
+
+    sources, timings = load_all_sources([name for name in names if name not in SOURCE_STREAMS])
+    print(format_timings(timings))
+
+    iso = sources["iso"]
+    uralic_set = sources.get("uralic")
+    cldr = sources.get("cldr", {})
+
+    # Nykyisen kielen rivi kustakin virrasta; context näkee ne lähdetauluina
+    row = {name: {} for name in SOURCE_STREAMS}
+    context = BuildContext.create(
+        sources={
+            "cldr": cldr,
+            "cldr_parsed": parse_cldr(cldr),
+            "iso_to_glottocode": sources.get("crosswalk", {}).get("iso_to_glottocode", {}),
+            **row,
+        },
+        families={URALIC: uralic_set or ()},
+    )
+
+    if uralic_set is not None and not uralic_set:
+        print("Warning: uralic.json missing or empty. All languages will have uralicNLP=False")
+
+    cursors = {name: SortedCursor(iter_sorted_stream(prepare_stream(name))) for name in streamed}
+
+    with open_writer(output, format, compression, index) as writer:
+        for lang_id in sorted(iso):
+            for name, cursor in cursors.items():
+                table = row[name]
+                table.clear()
+                value = cursor.seek(lang_id)
+                if value is not None:
+                    table[lang_id] = value
+
+            writer.write(lang_id, build_language(lang_id, iso[lang_id], context, None, fields))
+
+    return writer.count
+
 
 # ---------------------------------------------------------
 # Tallennus
 # ---------------------------------------------------------
 
-def main() -> None:
-    unified = build_unified()
+def default_output(fields=None, format=None, compression=None) -> Path:
+    """unified_languages.json / .ndjson (+ .gz/.xz); projektiolle unified_projected.*"""
+    path = OUTPUT if fields is None else OUTPUT_PROJECTED
+    if format == "ndjson":
+        path = path.with_suffix(".ndjson")
+    if compression:
+        path = path.with_name(path.name + "." + compression)
+    return path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build the unified language database.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Build languages in N worker processes (default: serial)")
+    parser.add_argument("--fields", help="Comma-separated fields for a partial (projected) build")
+    parser.add_argument("--output", type=Path, help="Output file")
+    parser.add_argument("--stream", action="store_true",
+                        help="Memory-bounded sorted-merge build, written record by record (ID order)")
+    parser.add_argument("--format", choices=sorted(WRITERS),
+                        help="Output format (default: from --output suffix, else indented json)")
+    parser.add_argument("--compress", choices=[c for c in COMPRESSORS if c])
+    parser.add_argument("--no-index", action="store_true",
+                        help="Do not write the byte-offset sidecar index")
+    args = parser.parse_args(argv)
+
+    fields = None
+    if args.fields:
+        try:
+            fields = parse_fields(args.fields)
+        except ValueError as e:
+            parser.error(str(e))
+
+    output = args.output or default_output(fields, args.format, args.compress)
+
+    if args.stream:
+        count = build_unified_streaming(output, fields, args.format, args.compress, not args.no_index)
+        print(f"Unified language database written to: {output} ({count} languages, streamed)")
+        return
 
-    with open(OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(unified, f, ensure_ascii=False, indent=2)
+    # Tietueet kirjoitetaan sitä mukaa kuin ne valmistuvat; koko unified-
+    # rakennetta ei kerätä muistiin ennen serialisointia
+    iso, context = prepare_build(fields)
+    with open_writer(output, args.format, args.compress, not args.no_index) as writer:
+        writer.write_all(iter_unified_records(iso, context, args.workers, fields))
 
-    print(f"Unified language database written to: {OUTPUT}")
+    print(f"Unified language database written to: {output}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from loaders.file_utils import atomic_write_bytes, content_hash, sha256_file
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FETCH_CACHE = PROJECT_ROOT / "data" / ".fetch_cache.json"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0 Safari/537.36"
+)
+
+MAX_WORKERS = 4
+TIMEOUT = 60
+
+
+@dataclass
+class Source:
+    """Ladattava lähde. sha256 on valinnainen julkaistu tarkistussumma."""
+    key: str
+    url: str
+    dest: Path
+    sha256: Optional[str] = None
+
+
+@dataclass
+class FetchResult:
+    key: str
+    path: Path
+    changed: bool
+    status: str  # "downloaded", "not-modified", "unchanged", "failed"
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+# ---------------------------------------------------------
+# Pipeline-lähteet
+# ---------------------------------------------------------
+
+DATA_ROOT = PROJECT_ROOT / "data"
+
+ISO_SOURCES = [
+    Source(
+        "iso_639_3",
+        "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3.tab",
+        DATA_ROOT / "iso_639_3.tab",
+    ),
+    Source(
+        "iso_639_3_names",
+        "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3_Name_Index.tab",
+        DATA_ROOT / "iso_639_3_names.tab",
+    ),
+    Source(
+        "iso_639_3_macrolanguages",
+        "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3-macrolanguages.tab",
+        DATA_ROOT / "iso_639_3_macrolanguages.tab",
+    ),
+    Source(
+        "iso_639_5",
+        "https://id.loc.gov/vocabulary/iso639-5.skos.rdf",
+        DATA_ROOT / "iso_639_5.rdf",
+    ),
+]
+
+# Virallinen CLDR-likelySubtags.json (Unicode Consortium)
+CLDR_SOURCE = Source(
+    "cldr_likely_subtags",
+    "https://raw.githubusercontent.com/unicode-org/cldr-json/"
+    "master/cldr-json/cldr-core/supplemental/likelySubtags.json",
+    DATA_ROOT / "cldr" / "likelySubtags.json",
+)
+
+
+def load_fetch_cache(path=FETCH_CACHE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_fetch_cache(meta, path=FETCH_CACHE):
+    data = json.dumps(meta, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write_bytes(path, data)
+
+
+def _local_copy_valid(source, entry):
+    """Paikallinen tiedosto kelpaa, jos sen tarkistussumma vastaa välimuistia."""
+    if not entry or entry.get("url") != source.url or not Path(source.dest).exists():
+        return False
+    digest = sha256_file(source.dest)
+    if source.sha256 and digest != source.sha256.lower():
+        return False
+    return digest == entry.get("sha256")
+
+
+def fetch_source(source, entry=None, timeout=TIMEOUT):
+    """
+    Lataa yhden lähteen ehdollisella pyynnöllä (ETag / If-Modified-Since).
+    Palauttaa (FetchResult, uusi välimuistimerkintä tai None).
+    """
+    dest = Path(source.dest)
+    headers = {"User-Agent": USER_AGENT}
+
+    valid = _local_copy_valid(source, entry)
+    if valid:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    req = urllib.request.Request(source.url, headers=headers)
+
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            body = response.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and valid:
+            return FetchResult(source.key, dest, False, "not-modified"), entry
+        return FetchResult(source.key, dest, False, "failed", f"HTTP {e.code}"), None
+    except (urllib.error.URLError, OSError) as e:
+        return FetchResult(source.key, dest, False, "failed", str(e)), None
+
+    digest = content_hash(body)
+
+    if source.sha256 and digest != source.sha256.lower():
+        return FetchResult(
+            source.key, dest, False, "failed",
+            f"checksum mismatch (expected {source.sha256}, got {digest})",
+        ), None
+
+    new_entry = {
+        "url": source.url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": digest,
+        "size": len(body),
+    }
+
+    # Palvelin ei tue ehdollisia pyyntöjä, mutta sisältö on sama
+    if valid and digest == entry.get("sha256"):
+        return FetchResult(source.key, dest, False, "unchanged"), new_entry
+
+    atomic_write_bytes(dest, body)
+    return FetchResult(source.key, dest, True, "downloaded"), new_entry
+
+
+def fetch_all(sources: Iterable[Source], max_workers=MAX_WORKERS,
+              cache_path=FETCH_CACHE, timeout=TIMEOUT) -> Dict[str, FetchResult]:
+    """
+    Lataa lähteet rinnakkain rajatulla säiepoolilla.
+    Metatietovälimuisti päivitetään kerran, kun kaikki lataukset ovat valmiit.
+    """
+    sources = list(sources)
+    meta = load_fetch_cache(cache_path)
+    lock = threading.Lock()
+    results = {}
+
+    def run(source):
+        result, entry = fetch_source(source, meta.get(source.key), timeout)
+        with lock:
+            if entry is not None:
+                meta[source.key] = entry
+            results[source.key] = result
+        print(f"{source.key}: {result.status}" + (f" ({result.error})" if result.error else ""))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(run, sources))
+
+    save_fetch_cache(meta, cache_path)
+    return {source.key: results[source.key] for source in sources}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 heksana tavujonosta."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path, chunk_size=1024 * 1024) -> str:
+    """SHA-256 tiedostosta lukien sen paloittain."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_stamp(path):
+    """Tiedoston koko ja mtime: kevyt tunniste johdettujen tiedostojen vanhenemiselle."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def compact_json_bytes(obj) -> bytes:
+    """Tiivis, deterministinen JSON-serialisointi (ei välilyöntejä)."""
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+    ).encode("utf-8")
+
+
+def _read_umask():
+    # os.umask() asettaa maskin samalla kun lukee sen, joten se luetaan
+    # vain kerran tuonnin aikana eikä kesken säikeistetyn kirjoituksen
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp luo tiedoston oikeuksin 0600; valmiille tiedostolle annetaan
+# samat oikeudet kuin open() antaisi
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def atomic_write_bytes(path, data: bytes) -> None:
+    """
+    Kirjoittaa tiedoston väliaikaistiedostoon samaan hakemistoon ja
+    vaihtaa sen paikalleen os.replace():lla. Lukija ei koskaan näe
+    puolikasta tiedostoa.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, DEFAULT_FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
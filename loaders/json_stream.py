@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+from contextlib import nullcontext
+
+WHITESPACE = " \t\r\n"
+
+
+def _skip_ws(text, i):
+    while i < len(text) and text[i] in WHITESPACE:
+        i += 1
+    return i
+
+
+def _iter_items(source, opening, chunk_size):
+    """
+    Lukee päätason JSON-objektin tai -taulukon alkio kerrallaan.
+    Objektista tuotetaan (avain, arvo) -pareja, taulukosta arvoja.
+
+    Puskurissa on kerrallaan vain yksi alkio ja yksi lukupala. Alkio
+    hyväksytään vasta, kun sen perässä näkyy ',' tai sulkeva merkki:
+    puskurin rajalla katkennut luku voisi muuten jäsentyä väärin.
+    """
+    object_mode = opening == "{"
+    closing = "}" if object_mode else "]"
+    what = "JSON object" if object_mode else "JSON array"
+    decoder = json.JSONDecoder()
+
+    if hasattr(source, "read"):
+        opened = nullcontext(source)
+        name = getattr(source, "name", "<stream>")
+    else:
+        opened = open(source, "r", encoding="utf-8")
+        name = source
+
+    with opened as f:
+        buf = f.read(chunk_size)
+        eof = not buf
+        pos = 0
+
+        # Etsi avaava merkki
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        if pos >= len(buf) or buf[pos] != opening:
+            raise ValueError(f"{name}: expected a {what}")
+        pos += 1
+
+        first = "key" if object_mode else "value"
+        state = first
+        key = None
+        seen = False
+        while True:
+            pos = _skip_ws(buf, pos)
+
+            if pos < len(buf):
+                ch = buf[pos]
+
+                if state == "sep":
+                    if ch == closing:
+                        break
+                    if ch != ",":
+                        raise ValueError(f"{name}: expected ',' or '{closing}' at offset {pos}")
+                    pos += 1
+                    state = first
+                    continue
+
+                if state == first and ch == closing:
+                    if seen:
+                        raise ValueError(f"{name}: trailing comma at offset {pos}")
+                    break
+
+                if state == "key":
+                    if ch != '"':
+                        raise ValueError(f"{name}: expected a string key at offset {pos}")
+                    try:
+                        key, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        end = None
+                    if end is not None:
+                        nxt = _skip_ws(buf, end)
+                        if nxt < len(buf):
+                            if buf[nxt] != ":":
+                                raise ValueError(f"{name}: expected ':' at offset {nxt}")
+                            pos = nxt + 1
+                            state = "value"
+                            continue
+                        if eof:
+                            raise ValueError(f"{name}: unexpected end of {what}")
+
+                else:  # state == "value"
+                    try:
+                        value, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        end = None
+                    if end is not None:
+                        nxt = _skip_ws(buf, end)
+                        if eof or (nxt < len(buf) and buf[nxt] in "," + closing):
+                            yield (key, value) if object_mode else value
+                            pos = end
+                            state = "sep"
+                            seen = True
+                            continue
+
+            elif eof:
+                raise ValueError(f"{name}: unexpected end of {what}")
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        # Sulkevan merkin jälkeen sallitaan vain tyhjää
+        pos += 1
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos < len(buf):
+                raise ValueError(f"{name}: extra data after the {what} at offset {pos}")
+            if eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+
+def iter_json_object(source, chunk_size=1 << 16):
+    """
+    Lukee päätason JSON-objektin (avain, arvo) -pareina ilman, että koko
+    tiedostoa ladataan muistiin. source on polku tai avattu tekstitiedosto.
+    """
+    return _iter_items(source, "{", chunk_size)
+
+
+def iter_json_array(source, chunk_size=1 << 16):
+    """Lukee päätason JSON-taulukon alkio kerrallaan (ks. iter_json_object)."""
+    return _iter_items(source, "[", chunk_size)
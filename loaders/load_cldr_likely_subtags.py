@@ -30,36 +30,29 @@
 #
 
 import json
-import urllib.request
 from pathlib import Path
 
+from loaders.fetch_sources import CLDR_SOURCE, fetch_all
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CLDR_ROOT = PROJECT_ROOT / "data" / "cldr"
 CLDR_ROOT.mkdir(parents=True, exist_ok=True)
 
-LOCAL_FILE = CLDR_ROOT / "likelySubtags.json"
+LOCAL_FILE = CLDR_SOURCE.dest
 
 # Virallinen CLDR-likelySubtags.json (Unicode Consortium)
-CLDR_URL = (
-    "https://raw.githubusercontent.com/unicode-org/cldr-json/"
-    "master/cldr-json/cldr-core/supplemental/likelySubtags.json"
-)
+CLDR_URL = CLDR_SOURCE.url
 
 
 def download_cldr_likely_subtags():
-    """Lataa virallisen CLDR-likelySubtags.json-tiedoston."""
-    try:
-        print("Downloading CLDR likelySubtags.json from Unicode CLDR...")
-        with urllib.request.urlopen(CLDR_URL) as response:
-            data = response.read().decode("utf-8")
-
-        with open(LOCAL_FILE, "w", encoding="utf-8") as f:
-            f.write(data)
+    """Lataa virallisen CLDR-likelySubtags.json-tiedoston yhteisen latauskerroksen kautta."""
+    print("Downloading CLDR likelySubtags.json from Unicode CLDR...")
+    result = fetch_all([CLDR_SOURCE])[CLDR_SOURCE.key]
 
+    if result.ok:
         print("CLDR likelySubtags.json downloaded successfully.")
-
-    except Exception as e:
-        print("Failed to download CLDR likelySubtags.json:", e)
+    else:
+        print("Failed to download CLDR likelySubtags.json:", result.error)
 
 
 def load_cldr_likely_subtags():
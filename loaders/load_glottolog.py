@@ -30,28 +30,142 @@
 #
 
 import json
+import re
 from pathlib import Path
 
+from loaders.json_stream import iter_json_object
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA = PROJECT_ROOT / "data" / "glottolog.json"
+CROSSWALK = PROJECT_ROOT / "data" / "glottolog_crosswalk.json"
+
+ISO_639_3_RE = re.compile(r"^[a-z]{3}$")
 
-def load_glottolog():
+
+def _load_raw():
     if not DATA.exists():
         return {}
-
     with open(DATA, "r", encoding="utf-8") as f:
-        raw = json.load(f)
+        return json.load(f)
+
+
+def glottolog_record(info):
+    """Glottolog-tietueen kentät, jotka build_unified yhdistää."""
+    return {
+        "macroarea": info.get("macroarea"),
+        "latitude": info.get("latitude"),
+        "longitude": info.get("longitude"),
+        "lineage": info.get("lineage", []),
+        "family": info.get("family"),
+    }
+
+
+def iso_key(code, info):
+    """ISO 639-3 -avain glottolog.json:n tietueelle tai None."""
+    iso = info.get("iso639_3")
+
+    # Vanha glottolog.json ilman ISO-kenttää voi olla jo ISO-avaimilla
+    if not iso and "iso639_3" not in info and ISO_639_3_RE.match(code):
+        iso = code
+
+    return iso
+
+
+def crosswalk_from_glottolog(raw):
+    """
+    Ristiviittaus glottolog.json:n iso639_3-kentistä. raw on jo ladattu
+    dict tai (glottocode, tietue) -parien virta (iter_json_object).
+
+    Jos useampi glottocode osoittaa samaan ISO-koodiin, törmäys kirjataan
+    ja valitaan deterministisesti koordinaatillinen, aakkosjärjestyksessä
+    ensimmäinen glottocode. build_glottolog_json.py tallentaa saman
+    rakenteen, joten valinta ei riipu siitä, onko tiedosto olemassa.
+    """
+    items = raw.items() if isinstance(raw, dict) else raw
+    entries = {}
+    for code, info in items:
+        iso = info.get("iso639_3")
+        # Toistuva glottocode: viimeinen arvo voittaa, kuten json.load:ssa
+        if iso:
+            entries[code] = (iso, info.get("latitude") is not None)
+        else:
+            entries.pop(code, None)
 
+    by_iso = {}
+    for code, (iso, has_coordinates) in entries.items():
+        by_iso.setdefault(iso, []).append((not has_coordinates, code))
+
+    iso_to_glottocode = {}
+    collisions = {}
+    for iso, candidates in sorted(by_iso.items()):
+        candidates.sort()
+        iso_to_glottocode[iso] = candidates[0][1]
+        if len(candidates) > 1:
+            collisions[iso] = [code for _, code in candidates]
+
+    return {
+        "glottocode_to_iso": {code: entries[code][0] for code in sorted(entries)},
+        "iso_to_glottocode": iso_to_glottocode,
+        "collisions": collisions,
+    }
+
+
+def load_glottolog_crosswalk(raw=None):
+    """
+    Palauttaa ristiviittauksen:
+    {"glottocode_to_iso": {...}, "iso_to_glottocode": {...}, "collisions": {...}}
+    Luetaan build_glottolog_json.py:n tuottamasta tiedostosta; jos sitä ei
+    ole, johdetaan glottolog.json:n iso639_3-kentistä (raw = jo ladattu
+    glottolog.json, jolloin tiedostoa ei lueta uudelleen). Ilman raw:ta
+    glottolog.json luetaan virtana tietue kerrallaan.
+    """
+    if CROSSWALK.exists():
+        with open(CROSSWALK, "r", encoding="utf-8") as f:
+            return json.load(f)
+    if raw is None:
+        raw = iter_json_object(DATA) if DATA.exists() else {}
+    return crosswalk_from_glottolog(raw)
+
+
+def load_glottolog(by_iso=False, raw=None, crosswalk=None):
+    """
+    Lataa glottolog.json:n.
+
+    by_iso=False: avaimena lähteen tunniste (glottocode).
+    by_iso=True:  avaimena ISO 639-3 -koodi, jotta build_unified voi
+                  yhdistää suoraan ISO-tunnisteilla. Törmäyksissä käytetään
+                  ristiviittauksen valitsemaa glottocodea.
+
+    raw ja crosswalk voidaan antaa valmiiksi ladattuina.
+    """
+    if raw is None:
+        raw = _load_raw()
+
+    if not by_iso:
+        return {code: glottolog_record(info) for code, info in raw.items()}
+
+    if crosswalk is None:
+        crosswalk = load_glottolog_crosswalk(raw)
+    preferred = crosswalk.get("iso_to_glottocode", {})
     glotto = {}
 
     for code, info in raw.items():
-        glotto[code] = {
-            "macroarea": info.get("macroarea"),
-            "latitude": info.get("latitude"),
-            "longitude": info.get("longitude"),
-            "lineage": info.get("lineage", []),
-            "family": info.get("family"),
-        }
+        iso = iso_key(code, info)
+        if not iso:
+            continue
+        if iso in glotto and preferred.get(iso) != code:
+            continue
+
+        glotto[iso] = glottolog_record(info)
 
     return glotto
 
+
+def load_glottolog_sources():
+    """
+    ISO-avaiminen glottolog ja ristiviittaus yhdellä glottolog.json:n
+    dekoodauksella: {"glottolog": {...}, "crosswalk": {...}}.
+    """
+    raw = _load_raw()
+    crosswalk = load_glottolog_crosswalk(raw)
+    return {"glottolog": load_glottolog(True, raw, crosswalk), "crosswalk": crosswalk}
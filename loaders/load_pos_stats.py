@@ -30,14 +30,225 @@
 #
 
 import json
+import math
+import sys
+from array import array
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # NumPy on valinnainen
+    np = None
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA = PROJECT_ROOT / "data" / "pos_stats.json"
+MATRIX = PROJECT_ROOT / "data" / "pos_stats_matrix.bin"
+
+# Binäärimuodon tunniste: MAGIC, JSON-otsake yhdellä rivillä, int64 LE -rivit
+MATRIX_MAGIC = b"GLFMPOS1\n"
+
 
-def load_pos_stats():
-    if not DATA.exists():
+def load_pos_stats(path=DATA):
+    path = Path(path)
+    if not path.exists():
         return {}
-    with open(DATA, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+
+def source_stamp(path):
+    """Lähdetiedoston tunniste (nimi, koko, mtime) matriisin otsakkeeseen."""
+    st = Path(path).stat()
+    return {"file": Path(path).name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+# ---------------------------------------------------------
+# Tiheä kieli × POS -matriisi
+# ---------------------------------------------------------
+
+class PosMatrix:
+    """
+    pos_stats tiheänä matriisina:
+    - langs: rivi-indeksi (kielikoodit)
+    - tags:  sarakeindeksi (POS-tagit)
+    - counts: int64-matriisi (NumPy ndarray, muuten array('q') rivijärjestyksessä)
+    """
+
+    def __init__(self, langs, tags, counts):
+        self.langs = list(langs)
+        self.tags = list(tags)
+        self.counts = counts
+        self.lang_index = {lang: i for i, lang in enumerate(self.langs)}
+        self.tag_index = {tag: j for j, tag in enumerate(self.tags)}
+
+    @property
+    def shape(self):
+        return len(self.langs), len(self.tags)
+
+    def __contains__(self, lang):
+        return lang in self.lang_index
+
+    def row(self, lang):
+        """Kielen POS-laskurit sarakejärjestyksessä."""
+        i = self.lang_index[lang]
+        if np is not None and isinstance(self.counts, np.ndarray):
+            return self.counts[i]
+        m = len(self.tags)
+        return self.counts[i * m:(i + 1) * m]
+
+    def get(self, lang, tag, default=0):
+        i = self.lang_index.get(lang)
+        j = self.tag_index.get(tag)
+        if i is None or j is None:
+            return default
+        return int(self.row(lang)[j])
+
+    def to_dict(self):
+        """Takaisin alkuperäiseen muotoon {lang: {tag: count}} (nollat pois)."""
+        return {
+            lang: {tag: int(c) for tag, c in zip(self.tags, self.row(lang)) if c}
+            for lang in self.langs
+        }
+
+    # --- Vektoroidut apufunktiot ---
+
+    def proportions(self, lang=None):
+        """
+        POS-osuudet riveittäin (rivisumma = 1, tyhjä rivi = nollia).
+        Ilman lang-parametria palauttaa koko matriisin.
+        """
+        if np is not None and isinstance(self.counts, np.ndarray):
+            counts = self.counts if lang is None else self.row(lang)[None, :]
+            totals = counts.sum(axis=1, keepdims=True).astype(np.float64)
+            out = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+            return out if lang is None else out[0]
+
+        langs = self.langs if lang is None else [lang]
+        rows = []
+        for code in langs:
+            r = self.row(code)
+            total = sum(r)
+            rows.append([c / total if total else 0.0 for c in r])
+        return rows if lang is None else rows[0]
+
+    def cosine(self, lang_a, lang_b):
+        """Kahden kielen POS-jakaumien kosinisamankaltaisuus."""
+        a = self.row(lang_a)
+        b = self.row(lang_b)
+        if np is not None and isinstance(self.counts, np.ndarray):
+            a = a.astype(np.float64)
+            b = b.astype(np.float64)
+            denom = np.linalg.norm(a) * np.linalg.norm(b)
+            return float(a @ b / denom) if denom else 0.0
+
+        dot = sum(x * y for x, y in zip(a, b))
+        denom = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / denom if denom else 0.0
+
+    def most_similar(self, lang, n=10):
+        """n samankaltaisinta kieltä (kosini) koko matriisia vastaan kerralla."""
+        if np is not None and isinstance(self.counts, np.ndarray):
+            m = self.counts.astype(np.float64)
+            norms = np.linalg.norm(m, axis=1)
+            q = m[self.lang_index[lang]]
+            denom = norms * np.linalg.norm(q)
+            sims = np.divide(m @ q, denom, out=np.zeros(len(self.langs)), where=denom > 0)
+            sims[self.lang_index[lang]] = -1.0
+            order = np.argsort(-sims, kind="stable")[:n]
+            return [(self.langs[i], float(sims[i])) for i in order if sims[i] > 0]
+
+        scored = [
+            (other, self.cosine(lang, other)) for other in self.langs if other != lang
+        ]
+        scored.sort(key=lambda item: -item[1])
+        return [(other, sim) for other, sim in scored[:n] if sim > 0]
+
+    def top_n(self, lang, n=5):
+        """Kielen n yleisintä POS-tagia: [(tag, count), ...]."""
+        r = self.row(lang)
+        if np is not None and isinstance(self.counts, np.ndarray):
+            order = np.argsort(-r, kind="stable")[:n]
+            return [(self.tags[j], int(r[j])) for j in order if r[j] > 0]
+
+        order = sorted(range(len(r)), key=lambda j: -r[j])[:n]
+        return [(self.tags[j], r[j]) for j in order if r[j] > 0]
+
+
+def pos_matrix_from_stats(stats):
+    """Rakentaa PosMatrixin {lang: {tag: count}} -dictistä."""
+    langs = sorted(lang for lang, counts in stats.items() if counts)
+    tags = sorted({tag for lang in langs for tag in stats[lang]})
+    tag_index = {tag: j for j, tag in enumerate(tags)}
+    m = len(tags)
+
+    flat = array("q", bytes(8 * len(langs) * m))
+    for i, lang in enumerate(langs):
+        base = i * m
+        for tag, count in stats[lang].items():
+            if isinstance(count, int):
+                flat[base + tag_index[tag]] = count
+
+    if np is not None:
+        counts = np.frombuffer(flat, dtype=np.int64).reshape(len(langs), m).copy()
+    else:
+        counts = flat
+    return PosMatrix(langs, tags, counts)
+
+
+def save_pos_matrix(matrix, path=MATRIX, source=None):
+    """
+    Tallentaa matriisin tiiviiseen binäärimuotoon. source = tiedosto, josta
+    matriisi laskettiin; sen koko ja mtime tallennetaan otsakkeeseen, jotta
+    load_pos_matrix tunnistaa vanhentuneen matriisin.
+    """
+    meta = {"langs": matrix.langs, "tags": matrix.tags, "dtype": "<i8"}
+    if source is not None:
+        meta["source"] = source_stamp(source)
+    header = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if np is not None and isinstance(matrix.counts, np.ndarray):
+        payload = matrix.counts.astype("<i8").tobytes()
+    else:
+        flat = array("q", matrix.counts)
+        if sys.byteorder == "big":
+            flat.byteswap()
+        payload = flat.tobytes()
+
+    with open(path, "wb") as f:
+        f.write(MATRIX_MAGIC)
+        f.write(header + b"\n")
+        f.write(payload)
+
+
+def load_pos_matrix(path=MATRIX, source=DATA, load_stats=load_pos_stats):
+    """
+    Lataa tallennetun matriisin. Jos binääritiedostoa ei ole tai se on
+    laskettu eri versiosta source-tiedostoa (koko/mtime eroaa otsakkeesta),
+    matriisi rakennetaan load_stats(source):n palauttamista tilastoista
+    ({lang: {tag: count}}, oletuksena pos_stats.json). source=None ohittaa
+    tarkistuksen.
+    """
+    path = Path(path)
+    if not path.exists():
+        return pos_matrix_from_stats(load_stats(source))
+
+    with open(path, "rb") as f:
+        if f.readline() != MATRIX_MAGIC:
+            raise ValueError(f"Not a POS matrix file: {path}")
+        header = json.loads(f.readline())
+        if source is not None and Path(source).exists() \
+                and header.get("source") != source_stamp(source):
+            return pos_matrix_from_stats(load_stats(source))
+        payload = f.read()
+
+    langs, tags = header["langs"], header["tags"]
+
+    if np is not None:
+        counts = np.frombuffer(payload, dtype="<i8").astype(np.int64).reshape(len(langs), len(tags))
+    else:
+        counts = array("q")
+        counts.frombytes(payload)
+        if sys.byteorder == "big":
+            counts.byteswap()
+
+    return PosMatrix(langs, tags, counts)
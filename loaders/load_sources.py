@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from loaders.load_iso_639 import load_iso_639
+from loaders.load_cldr_likely_subtags import LOCAL_FILE as CLDR_FILE, load_cldr_likely_subtags
+from loaders.load_wiktionary_languages import FILE as WIKT_FILE, load_wiktionary_languages
+from loaders.load_uralic_languages import URALIC_FILE, load_uralic_languages
+from loaders.load_written_languages import FILE as WRITTEN_FILE, load_written_languages
+from loaders.load_glottolog import (
+    CROSSWALK, DATA as GLOTTOLOG_FILE,
+    load_glottolog, load_glottolog_crosswalk, load_glottolog_sources,
+)
+from loaders.load_pos_stats import DATA as POS_STATS_FILE, load_pos_stats
+
+# Nimi → latausfunktio. Funktioiden on oltava moduulitason funktioita
+# (tai partial niistä), jotta ne voidaan välittää prosessipooliin.
+SOURCE_LOADERS = {
+    "iso": load_iso_639,
+    "cldr": load_cldr_likely_subtags,
+    "wikt": load_wiktionary_languages,
+    "written": load_written_languages,
+    "uralic": load_uralic_languages,
+    "glottolog": partial(load_glottolog, by_iso=True),
+    "crosswalk": load_glottolog_crosswalk,
+    "pos_stats": load_pos_stats,
+}
+
+
+# Lähteet, jotka luetaan samasta tiedostosta: kun kaikki pyydetään,
+# ne ladataan yhdellä kutsulla (glottolog.json dekoodataan kerran)
+SOURCE_GROUPS = {
+    ("glottolog", "crosswalk"): load_glottolog_sources,
+}
+
+# Lähteiden tiedostot rinnakkaislatauksen kokoarviota varten
+SOURCE_PATHS = {
+    "cldr": CLDR_FILE,
+    "wikt": WIKT_FILE,
+    "written": WRITTEN_FILE,
+    "uralic": URALIC_FILE,
+    "glottolog": GLOTTOLOG_FILE,
+    "crosswalk": CROSSWALK,
+    "pos_stats": POS_STATS_FILE,
+}
+
+# Prosessipooli kannattaa vain suurilla syötteillä ja usealla ytimellä:
+# pienillä tiedostoilla prosessien käynnistys ja tulosten pickle maksavat
+# enemmän kuin rinnakkainen dekoodaus säästää
+PARALLEL_MIN_BYTES = 256 * 1024 * 1024
+
+
+# Lähde → Language-kentät, joihin se vaikuttaa. ISO-lähde määrää
+# kielijoukon, joten se ladataan aina.
+SOURCE_FIELDS = {
+    "iso": {"id", "name", "official_name", "iso639_1", "iso639_2B", "iso639_2T",
+            "iso639_3", "iso639_5", "default_script", "default_region", "bcp47",
+            "written_scripts"},
+    "cldr": {"default_script", "default_region", "bcp47", "written_scripts"},
+    "wikt": {"name", "official_name", "default_script", "default_region", "bcp47",
+             "fallback", "written_scripts"},
+    "written": {"default_script", "bcp47", "written", "written_scripts", "glottocode", "family"},
+    "uralic": {"uralicNLP"},
+    "glottolog": {"glottolog"},
+    "crosswalk": {"glottocode"},
+    "pos_stats": {"pos_stats"},
+}
+
+REQUIRED_SOURCES = ("iso",)
+
+
+def sources_for_fields(fields=None):
+    """
+    Lähteet, jotka tarvitaan annettujen kenttien laskemiseen,
+    SOURCE_LOADERS-järjestyksessä. fields=None → kaikki lähteet.
+    """
+    if fields is None:
+        return list(SOURCE_LOADERS)
+    wanted = set(fields)
+    return [
+        name for name in SOURCE_LOADERS
+        if name in REQUIRED_SOURCES or SOURCE_FIELDS.get(name, set()) & wanted
+    ]
+
+
+def _plan(names):
+    """Lataustehtävät: SOURCE_GROUPS-ryhmät yhtenä, muut lähteet yksittäin."""
+    tasks = []
+    remaining = list(names)
+    for group in SOURCE_GROUPS:
+        if all(name in remaining for name in group):
+            tasks.append(group)
+            remaining = [name for name in remaining if name not in group]
+    return tasks + [(name,) for name in remaining]
+
+
+def _run_loader(task):
+    """Ajetaan (työ)prosessissa: palauttaa (tehtävä, {nimi: data}, kesto sekunteina)."""
+    start = time.perf_counter()
+    if task in SOURCE_GROUPS:
+        data = SOURCE_GROUPS[task]()
+    else:
+        data = {task[0]: SOURCE_LOADERS[task[0]]()}
+    return task, data, time.perf_counter() - start
+
+
+def _load_serial(tasks):
+    loaded, timings = {}, {}
+    for task in tasks:
+        _, data, seconds = _run_loader(task)
+        loaded.update(data)
+        timings["+".join(task)] = seconds
+    return loaded, timings
+
+
+def input_bytes(names):
+    """Lähdetiedostojen yhteiskoko (puuttuvat tiedostot ohitetaan)."""
+    return sum(
+        SOURCE_PATHS[name].stat().st_size
+        for name in names
+        if name in SOURCE_PATHS and SOURCE_PATHS[name].exists()
+    )
+
+
+def load_all_sources(names=None, parallel=None, workers=None):
+    """
+    Lataa kaikki datalähteet.
+
+    Oletuksena (parallel=None) lähteet ladataan peräkkäin. Prosessipoolia
+    käytetään vain, jos ytimiä on useampi ja syötteet ovat suuria
+    (PARALLEL_MIN_BYTES); parallel=True/False pakottaa valinnan.
+
+    Palauttaa (sources, timings):
+        sources = {"iso": {...}, "cldr": {...}, ...}
+        timings = {"iso": 0.42, ..., "total": 0.61}
+    """
+    names = list(names or SOURCE_LOADERS)
+    tasks = _plan(names)
+    start = time.perf_counter()
+
+    cpus = os.cpu_count() or 1
+    if parallel is None:
+        parallel = cpus > 1 and input_bytes(names) >= PARALLEL_MIN_BYTES
+
+    if not parallel or len(tasks) < 2:
+        loaded, timings = _load_serial(tasks)
+    else:
+        workers = workers or min(len(tasks), cpus)
+        loaded, timings = {}, {}
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for task, data, seconds in pool.map(_run_loader, tasks):
+                    loaded.update(data)
+                    timings["+".join(task)] = seconds
+        except (OSError, BrokenProcessPool) as e:
+            # Ympäristö ei salli aliprosesseja → ladataan peräkkäin
+            print(f"Warning: parallel loading failed ({e}), loading sources serially")
+            loaded, timings = _load_serial(tasks)
+
+    sources = {name: loaded[name] for name in names}
+    timings["total"] = time.perf_counter() - start
+    return sources, timings
+
+
+def format_timings(timings):
+    """Yksirivinen yhteenveto latausajoista, hitain ensin."""
+    parts = sorted(
+        ((name, t) for name, t in timings.items() if name != "total"),
+        key=lambda item: -item[1],
+    )
+    details = ", ".join(f"{name} {t:.2f}s" for name, t in parts)
+    return f"Sources loaded in {timings['total']:.2f}s ({details})"
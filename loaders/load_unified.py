@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import io
+import json
+import lzma
+from pathlib import Path
+
+from loaders.file_utils import sha256_file
+from loaders.json_stream import iter_json_object
+from writers.unified_writers import INDEX_VERSION, format_of, index_path_of
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+def open_unified_text(path):
+    """Avaa unified-tiedoston tekstinä; gzip/xz tunnistetaan tiedoston alusta."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+
+    if head.startswith(GZIP_MAGIC):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8")
+    if head.startswith(XZ_MAGIC):
+        return io.TextIOWrapper(lzma.open(path, "rb"), encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_unified(path=UNIFIED, format=None):
+    """
+    Lukee unified-datan (lang_id, tietue) -pareina pitämättä koko
+    tiedostoa muistissa. Tukee kaikkia writers.unified_writers -muotoja:
+    JSON (sisennetty tai tiivis) ja NDJSON, pakattuna tai ilman.
+    format päätellään päätteestä (.ndjson/.jsonl → NDJSON).
+    """
+    format = format or format_of(path)
+
+    with open_unified_text(path) as f:
+        if format == "ndjson":
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["id"], record
+        else:
+            yield from iter_json_object(f)
+
+
+def load_unified(path=UNIFIED, format=None):
+    """Koko unified-data dictinä (pienille tiedostoille ja vanhoille kutsujille)."""
+    return dict(iter_unified(path, format))
+
+
+# ---------------------------------------------------------
+# Hajasaanti tavuoffset-indeksin kautta
+# ---------------------------------------------------------
+
+class StaleIndexError(ValueError):
+    pass
+
+
+class UnifiedIndex:
+    """
+    Lukee yksittäisiä kieliä unified-tiedostosta ilman koko tiedoston
+    jäsentämistä: sivutiedosto (index_path_of) kertoo kunkin tietueen
+    tavualueen, ja get() hakee ja dekoodaa vain sen.
+
+    Indeksi tarkistetaan avattaessa: koon on täsmättävä, ja jos mtime on
+    muuttunut, tiedoston sha256 lasketaan ja verrataan tallennettuun.
+    Toimii sekä JSON- että NDJSON-tulosteille (ei pakatuille).
+
+        index = UnifiedIndex()
+        index.get("fin")
+    """
+
+    def __init__(self, path=UNIFIED, verify=True):
+        self.path = Path(path)
+        index_path = index_path_of(self.path)
+
+        if not index_path.exists():
+            raise FileNotFoundError(f"Missing offset index: {index_path}")
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("version") != INDEX_VERSION:
+            raise StaleIndexError(f"Unsupported offset index version: {meta.get('version')}")
+        if verify:
+            self._verify(meta)
+
+        self.format = meta["format"]
+        self.sha256 = meta["sha256"]
+        self.offsets = meta["offsets"]
+        self._f = open(self.path, "rb")
+
+    def _verify(self, meta):
+        st = self.path.stat()
+        if st.st_size != meta["size"]:
+            raise StaleIndexError(f"{self.path} does not match its offset index (size differs)")
+        if st.st_mtime_ns != meta["mtime_ns"] and sha256_file(self.path) != meta["sha256"]:
+            raise StaleIndexError(f"{self.path} does not match its offset index (content hash differs)")
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, lang_id):
+        return lang_id in self.offsets
+
+    def ids(self):
+        return list(self.offsets)
+
+    def get(self, lang_id, default=None):
+        span = self.offsets.get(lang_id)
+        if span is None:
+            return default
+        start, end = span
+        self._f.seek(start)
+        return json.loads(self._f.read(end - start).decode("utf-8"))
+
+    def get_many(self, lang_ids):
+        """{lang_id: tietue} annetuille kielille; haut tehdään tiedostojärjestyksessä."""
+        found = [(self.offsets[i][0], i) for i in lang_ids if i in self.offsets]
+        return {lang_id: self.get(lang_id) for _, lang_id in sorted(found)}
+
+
+def load_language(lang_id, path=UNIFIED):
+    """Yhden kielen tietue indeksin kautta (tai None)."""
+    with UnifiedIndex(path) as index:
+        return index.get(lang_id)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import inspect
+import json
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+from loaders.load_unified import iter_unified
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+
+MAGIC = b"GLFMSHM\0"
+LAYOUT_VERSION = 1
+# magic, versio, kielten määrä, avaimen leveys, indeksin alku, datan alku, datan koko
+HEADER = struct.Struct("<8sIIIQQQ")
+
+# Python 3.13+: SharedMemory(track=False) liittyy ilman resource_trackeria
+_HAS_TRACK = "track" in inspect.signature(shared_memory.SharedMemory).parameters
+
+
+def _entry_struct(key_width):
+    # avain (UTF-8, nollilla täytetty), blobin alku datassa, blobin pituus
+    return struct.Struct(f"<{key_width}sQI")
+
+
+def _open_untracked(name):
+    """
+    Avaa olemassa olevan segmentin ilman resource_trackerin seurantaa.
+    Muuten liittyvän prosessin päättyminen (tai sen jaettu tracker) voisi
+    poistaa segmentin omistajan alta. Python 3.13+: track=False; vanhemmissa
+    POSIX-versioissa liitoksen tekemä rekisteröinti perutaan heti.
+    """
+    if _HAS_TRACK:
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def pack_unified(records):
+    """
+    Serialisoi (lang_id, tietue) -parit jaetun muistin asetteluun:
+
+      otsake    HEADER
+      indeksi   count × (avain, alku, pituus), avaimet tavujärjestyksessä
+      data      tiiviit JSON-blobit peräkkäin
+
+    Palauttaa bytes-olion.
+    """
+    items = records.items() if isinstance(records, dict) else records
+    blobs = sorted(
+        (lang_id.encode("utf-8"), json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        for lang_id, record in items
+    )
+
+    key_width = max((len(key) for key, _ in blobs), default=1)
+    entry = _entry_struct(key_width)
+    index_offset = HEADER.size
+    data_offset = index_offset + entry.size * len(blobs)
+    data_size = sum(len(blob) for _, blob in blobs)
+
+    out = bytearray(data_offset + data_size)
+    HEADER.pack_into(out, 0, MAGIC, LAYOUT_VERSION, len(blobs), key_width,
+                     index_offset, data_offset, data_size)
+
+    pos = 0
+    for i, (key, blob) in enumerate(blobs):
+        entry.pack_into(out, index_offset + i * entry.size, key, pos, len(blob))
+        out[data_offset + pos:data_offset + pos + len(blob)] = blob
+        pos += len(blob)
+
+    return bytes(out)
+
+
+class SharedUnified:
+    """
+    Unified-data jaetussa muistissa (multiprocessing.shared_memory).
+
+    Pääprosessi luo segmentin kerran (create), ja työprosessit liittyvät
+    siihen nimellä (attach). Liittyminen ei kopioi dataa: haku tekee
+    binäärihaun kiinteälevyiseen indeksiin ja dekoodaa vain pyydetyn
+    tietueen. Puskuri on työprosesseille vain luku -näkymä.
+
+        # pääprosessi
+        shared = SharedUnified.create()
+        start_workers(shared.name)
+        ...
+        shared.close(); shared.unlink()
+
+        # työprosessi
+        with SharedUnified.attach(name) as shared:
+            shared.get("fin")
+    """
+
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        self.buf = shm.buf.toreadonly()
+
+        magic, version, count, key_width, index_offset, data_offset, data_size = \
+            HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.name} is not a shared unified segment")
+        if version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported shared unified layout version: {version}")
+
+        self.count = count
+        self.key_width = key_width
+        self._entry = _entry_struct(key_width)
+        self._index_offset = index_offset
+        self._data_offset = data_offset
+
+    @classmethod
+    def create(cls, path=UNIFIED, name=None, records=None):
+        """Lukee unified-datan (tai records-parit) ja kopioi sen uuteen segmenttiin."""
+        data = pack_unified(records if records is not None else iter_unified(path))
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_open_untracked(name))
+
+    def close(self):
+        if self.buf is not None:
+            self.buf.release()
+            self.buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """Poistaa segmentin (vain omistaja, kun työprosessit ovat valmiita)."""
+        if not _HAS_TRACK and os.name == "posix":
+            # Saman trackerin jakavan työprosessin peruutus (_open_untracked)
+            # poistaa myös omistajan merkinnän; palautetaan se, jotta
+            # unlink():n oma peruutus ei päädy KeyErroriin trackerissa
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- Indeksi ---
+
+    def _key_at(self, i):
+        start = self._index_offset + i * self._entry.size
+        return bytes(self.buf[start:start + self.key_width]).rstrip(b"\0")
+
+    def _find(self, lang_id):
+        key = lang_id.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key_at(lo) == key:
+            return lo
+        return None
+
+    def _span(self, i):
+        _, start, length = self._entry.unpack_from(self.buf, self._index_offset + i * self._entry.size)
+        start += self._data_offset
+        return start, start + length
+
+    # --- Haut ---
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, lang_id):
+        return self._find(lang_id) is not None
+
+    def ids(self):
+        return [self._key_at(i).decode("utf-8") for i in range(self.count)]
+
+    def raw(self, lang_id):
+        """
+        Tietueen JSON-tavut muistinäkymänä (ei kopiota) tai None.
+        Näkymä on vapautettava (release) ennen close()-kutsua.
+        """
+        i = self._find(lang_id)
+        if i is None:
+            return None
+        start, end = self._span(i)
+        return self.buf[start:end]
+
+    def get(self, lang_id, default=None):
+        i = self._find(lang_id)
+        if i is None:
+            return default
+        start, end = self._span(i)
+        return json.loads(bytes(self.buf[start:end]).decode("utf-8"))
+
+    def get_many(self, lang_ids):
+        """{lang_id: tietue} annetuille kielille (puuttuvat ohitetaan)."""
+        found = {}
+        for lang_id in lang_ids:
+            record = self.get(lang_id)
+            if record is not None:
+                found[lang_id] = record
+        return found
+
+    def items(self):
+        """(lang_id, tietue) kaikille kielille avainjärjestyksessä."""
+        for i in range(self.count):
+            start, end = self._span(i)
+            yield self._key_at(i).decode("utf-8"), json.loads(bytes(self.buf[start:end]).decode("utf-8"))
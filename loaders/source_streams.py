@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import heapq
+import json
+import os
+import tempfile
+from itertools import groupby
+from pathlib import Path
+
+from loaders.file_utils import DEFAULT_FILE_MODE, atomic_write_bytes
+from loaders.json_stream import iter_json_object
+from loaders.load_glottolog import DATA as GLOTTOLOG_DATA, glottolog_record, iso_key, load_glottolog_crosswalk
+from loaders.load_pos_stats import DATA as POS_STATS_DATA
+from loaders.load_wiktionary_languages import FILE as WIKT_FILE
+from loaders.load_written_languages import FILE as WRITTEN_FILE
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STREAMS_DIR = PROJECT_ROOT / "data" / ".streams"
+
+STREAM_VERSION = 2
+# Muistissa lajiteltavan ajon koko (tietueita) ulkoisessa lajittelussa
+RUN_SIZE = 50000
+
+
+# ---------------------------------------------------------
+# Ulkoinen lajittelu ID-järjestykseen
+# ---------------------------------------------------------
+
+def _write_run(items, directory):
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".run.", suffix=".jsonl")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for item in sorted(items, key=lambda item: (item[0], item[1])):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    return tmp
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def last_value(values):
+    # Toistuva avain: viimeinen arvo voittaa, kuten json.load:ssa
+    return values[-1]
+
+
+def external_sort(pairs, dest, reduce=last_value, run_size=RUN_SIZE):
+    """
+    Lajittelee (id, arvo) -parit tiedostoon dest JSONL-riveinä [id, arvo].
+    Muistissa on kerrallaan enintään run_size paria: ajot lajitellaan
+    väliaikaistiedostoihin ja yhdistetään heapq.merge:llä.
+
+    Saman ID:n arvot (lähdejärjestyksessä) välitetään reduce-funktiolle,
+    joka valitsee tallennettavan arvon.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    runs = []
+    batch = []
+    try:
+        # Järjestysnumero pitää saman ID:n arvot lähdejärjestyksessä
+        for seq, (key, value) in enumerate(pairs):
+            batch.append((key, seq, value))
+            if len(batch) >= run_size:
+                runs.append(_write_run(batch, dest.parent))
+                batch = []
+        if batch or not runs:
+            runs.append(_write_run(batch, dest.parent))
+
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                merged = heapq.merge(*(_read_run(r) for r in runs), key=lambda item: (item[0], item[1]))
+                for key, group in groupby(merged, key=lambda item: item[0]):
+                    value = reduce([item[2] for item in group])
+                    out.write(json.dumps([key, value], ensure_ascii=False) + "\n")
+            os.chmod(tmp, DEFAULT_FILE_MODE)
+            os.replace(tmp, dest)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+    finally:
+        for r in runs:
+            if os.path.exists(r):
+                os.unlink(r)
+
+    return dest
+
+
+def iter_sorted_stream(path):
+    """Lukee external_sort:n tuottaman tiedoston (id, arvo) -pareina."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            key, value = json.loads(line)
+            yield key, value
+
+
+# ---------------------------------------------------------
+# Lähdekohtaiset virrat (samat muunnokset kuin load_*-funktioissa)
+# ---------------------------------------------------------
+
+def _written_pairs():
+    for lang_id, info in iter_json_object(WRITTEN_FILE):
+        # Sama siivous kuin load_written_languages
+        scripts = info.get("scripts", [])
+        info["scripts"] = [s for s in scripts if s and s.upper() != "UNKNOWN"]
+        yield lang_id, info
+
+
+def _glottolog_pairs():
+    # Sama ISO-avainnus kuin load_glottolog(by_iso=True)
+    preferred = load_glottolog_crosswalk().get("iso_to_glottocode", {})
+    for code, info in iter_json_object(GLOTTOLOG_DATA):
+        iso = iso_key(code, info)
+        if iso:
+            yield iso, {"code": code, "preferred": preferred.get(iso) == code, "record": glottolog_record(info)}
+
+
+def _glottolog_reduce(values):
+    # Sama valinta kuin json.load + load_glottolog(by_iso=True): toistuvasta
+    # glottocodesta viimeinen arvo, törmäyksessä ristiviittauksen valitsema
+    # glottocode, muuten ensimmäinen
+    latest = {}
+    for v in values:
+        latest[v["code"]] = v
+    for v in latest.values():
+        if v["preferred"]:
+            return v["record"]
+    return next(iter(latest.values()))["record"]
+
+
+# Nimi → (lähdetiedosto, parigeneraattori, reduce)
+SOURCE_STREAMS = {
+    "wikt": (WIKT_FILE, lambda: iter_json_object(WIKT_FILE), last_value),
+    "written": (WRITTEN_FILE, _written_pairs, last_value),
+    "glottolog": (GLOTTOLOG_DATA, _glottolog_pairs, _glottolog_reduce),
+    "pos_stats": (POS_STATS_DATA, lambda: iter_json_object(POS_STATS_DATA), last_value),
+}
+
+
+def _signature(path):
+    if not Path(path).exists():
+        return None
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def prepare_stream(name, streams_dir=STREAMS_DIR):
+    """
+    Palauttaa lähteen ID-järjestetyn JSONL-tiedoston polun ja rakentaa
+    sen tarvittaessa. Valmis virta käytetään uudelleen, jos lähdetiedoston
+    mtime ja koko (ja glottologilla ristiviittaus) ovat ennallaan.
+    """
+    source, pairs, reduce = SOURCE_STREAMS[name]
+    streams_dir = Path(streams_dir)
+    dest = streams_dir / f"{name}.jsonl"
+    meta_path = streams_dir / f"{name}.meta.json"
+
+    deps = [str(source)]
+    if name == "glottolog":
+        from loaders.load_glottolog import CROSSWALK
+        deps.append(str(CROSSWALK))
+    meta = {"version": STREAM_VERSION, "sources": {d: _signature(d) for d in deps}}
+
+    if dest.exists() and meta_path.exists():
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                if json.load(f) == meta:
+                    return dest
+        except (OSError, ValueError):
+            pass
+
+    streams_dir.mkdir(parents=True, exist_ok=True)
+    if Path(source).exists():
+        external_sort(pairs(), dest, reduce)
+    else:
+        external_sort(iter(()), dest)
+
+    atomic_write_bytes(meta_path, json.dumps(meta).encode("utf-8"))
+    return dest
+
+
+class SortedCursor:
+    """
+    Etenee ID-järjestettyä virtaa vain eteenpäin. Merge join kysyy
+    arvoa kasvavassa ID-järjestyksessä: seek(lang_id) ohittaa pienemmät
+    avaimet ja palauttaa osuman arvon (tai None).
+    """
+
+    def __init__(self, pairs):
+        self._pairs = iter(pairs)
+        self._current = next(self._pairs, None)
+
+    def seek(self, lang_id):
+        while self._current is not None and self._current[0] < lang_id:
+            self._current = next(self._pairs, None)
+        if self._current is not None and self._current[0] == lang_id:
+            return self._current[1]
+        return None
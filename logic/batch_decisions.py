@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+# Puuttuvan arvon merkki (erotuksena tyhjästä merkkijonosta)
+_MISSING = object()
+
+
+def _first_known(scripts):
+    for s in scripts:
+        if s and s.upper() != "UNKNOWN":
+            return s
+    return None
+
+
+def parse_cldr(cldr):
+    """
+    Jäsentää CLDR likelySubtags -taulun kerran:
+        {avain: (script, region)}
+    script/region on _MISSING, jos skalaarifunktio ei käyttäisi sitä.
+    Säilyttää decide_default_script/region -funktioiden säännöt tarkasti.
+    """
+    parsed = {}
+    for key, tag in cldr.items():
+        if not isinstance(tag, str):
+            parsed[key] = (_MISSING, _MISSING)
+            continue
+        parts = tag.split("-")
+        script = parts[1] if len(parts) >= 2 else _MISSING
+        region = _MISSING
+        if len(parts) == 3 and parts[2] and parts[2].upper() != "UNKNOWN":
+            region = parts[2]
+        parsed[key] = (script, region)
+    return parsed
+
+
+def decide_columns(lang_ids, iso_rows, wikt_rows, written_rows, cldr, parsed_cldr=None, context=None):
+    """
+    Sarakeversio decide_default_script-, decide_default_region- ja
+    build_bcp47-funktioista. Syötteet ovat rinnakkaisia listoja
+    (sama indeksi = sama kieli). CLDR jäsennetään vain kerran;
+    parsed_cldr voidaan antaa valmiina, jos samaa taulua käytetään
+    useassa erässä.
+
+    Palauttaa {"default_script": [...], "default_region": [...], "bcp47": [...]}
+    ja tulos on sama kuin skalaarifunktioilla (samalla contextilla).
+    """
+    if parsed_cldr is None:
+        parsed_cldr = parse_cldr(cldr)
+    fallback_script = context.setting("fallback_script") if context is not None else "Latn"
+    fallback_region = context.setting("fallback_region") if context is not None else "001"
+    no_entry = (_MISSING, _MISSING)
+
+    scripts, regions, tags = [], [], []
+
+    for lang_id, iso_info, w, written in zip(lang_ids, iso_rows, wikt_rows, written_rows):
+        iso1 = iso_info.get("iso639_1", _MISSING)
+
+        # --- Skripti: written → CLDR → Wiktionary → Latn ---
+        script = _first_known(written["scripts"]) if written and written.get("scripts") else None
+        if script is None:
+            # decide_default_script: iso_info.get("iso639_1", lang_id)
+            key = lang_id if iso1 is _MISSING else iso1
+            cldr_script = parsed_cldr.get(key, no_entry)[0]
+            if cldr_script is not _MISSING:
+                script = cldr_script
+            elif w and w.get("scripts"):
+                script = _first_known(w["scripts"])
+            if script is None:
+                script = fallback_script
+
+        # --- Alue: CLDR → Wiktionary → 001 ---
+        # resolve_cldr_key: iso639_1 jos tosi, muuten lang_id
+        region_key = iso1 if iso1 is not _MISSING and iso1 else lang_id
+        region = parsed_cldr.get(region_key, no_entry)[1]
+        if region is _MISSING:
+            region = fallback_region
+            if w and w.get("region"):
+                r = w["region"]
+                if r and r.upper() != "UNKNOWN":
+                    region = r
+
+        # --- BCP-47 ---
+        parts = [iso_info.get("iso639_1") or lang_id]
+        if script and script.strip() and script.upper() != "UNKNOWN":
+            parts.append(script)
+        if region and region.strip() and region.upper() not in ("UNKNOWN", "001"):
+            parts.append(region)
+
+        scripts.append(script)
+        regions.append(region)
+        tags.append("-".join(parts))
+
+    return {"default_script": scripts, "default_region": regions, "bcp47": tags}
+
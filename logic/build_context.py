@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+# Kieliperhe, jonka jäsenyys näkyy uralicNLP-kentässä
+URALIC = "Uralic"
+
+# Päätöslogiikan oletusasetukset
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "fallback_script": "Latn",
+    "fallback_region": "001",
+}
+
+
+@dataclass(frozen=True)
+class BuildContext:
+    """
+    Yhden buildin tila: lähdetaulut, kieliperheiden jäsenjoukot ja
+    päätösasetukset. Konteksti välitetään logic-funktioille
+    eksplisiittisesti, joten useita erilaisia buildeja voi ajaa samassa
+    prosessissa (säikeissä tai palvelimessa) ilman globaalia tilaa.
+
+    sources:  {"cldr": {...}, "wikt": {...}, "written": {...}, ...}
+    families: {"Uralic": frozenset({"fin", "est", ...}), ...}
+    settings: DEFAULT_SETTINGS -avaimet, ylikirjoitettavissa
+    """
+
+    sources: Dict[str, Any] = field(default_factory=dict)
+    families: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def create(cls, sources=None, families: Optional[Dict[str, Iterable[str]]] = None, **settings):
+        return cls(
+            sources=dict(sources or {}),
+            families={name: frozenset(members) for name, members in (families or {}).items()},
+            settings={**DEFAULT_SETTINGS, **settings},
+        )
+
+    def source(self, name, default=None):
+        return self.sources.get(name, {} if default is None else default)
+
+    def setting(self, name):
+        return self.settings.get(name, DEFAULT_SETTINGS.get(name))
+
+    def in_family(self, lang_id, family) -> bool:
+        return lang_id in self.families.get(family, ())
+
+    def with_family(self, family, members) -> "BuildContext":
+        """Uusi konteksti, jossa perheen jäsenjoukko on vaihdettu."""
+        return replace(self, families={**self.families, family: frozenset(members)})
+
+    def with_settings(self, **settings) -> "BuildContext":
+        return replace(self, settings={**self.settings, **settings})
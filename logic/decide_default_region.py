@@ -31,12 +31,12 @@
 
 from logic.resolve_cldr_key import resolve_cldr_key
 
-def decide_default_region(lang_id, wikt, cldr, iso_info):
+def decide_default_region(lang_id, wikt, cldr, iso_info, context=None):
     """
     Päätetään oletusalue:
     1. CLDR likelySubtags → region (fi-Latn-FI → FI)
     2. Wiktionary → region (jos löytyy ja ei UNKNOWN)
-    3. fallback: '001' (World)
+    3. fallback: '001' (World) (tai context.settings["fallback_region"])
     """
 
     # 1. CLDR
@@ -57,5 +57,7 @@ def decide_default_region(lang_id, wikt, cldr, iso_info):
             return region
 
     # 3. fallback
+    if context is not None:
+        return context.setting("fallback_region")
     return "001"
 
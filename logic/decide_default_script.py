@@ -29,13 +29,13 @@
 # SOFTWARE.
 #
 
-def decide_default_script(lang_id, wikt, cldr, written, iso_info):
+def decide_default_script(lang_id, wikt, cldr, written, iso_info, context=None):
     """
     Päätetään oletusskripti:
     1. written-languages → ensimmäinen tunnettu script
     2. CLDR likelySubtags → script
     3. Wiktionary → ensimmäinen tunnettu script
-    4. fallback: 'Latn'
+    4. fallback: 'Latn' (tai context.settings["fallback_script"])
     """
 
     # 1. Written-languages
@@ -60,5 +60,7 @@ def decide_default_script(lang_id, wikt, cldr, written, iso_info):
                 return s
 
     # 4. fallback
+    if context is not None:
+        return context.setting("fallback_script")
     return "Latn"
 
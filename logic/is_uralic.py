@@ -29,12 +29,17 @@
 # SOFTWARE.
 #
 
+from logic.build_context import URALIC
+
+# Taaksepäin yhteensopiva globaali tila: käytetään vain, kun kontekstia
+# ei anneta. Uudet kutsujat välittävät BuildContextin.
 _URALIC_SET = set()
 
 def set_uralic_langs(lang_set):
     global _URALIC_SET
     _URALIC_SET = set(lang_set)
 
-def is_uralic(lang_id):
+def is_uralic(lang_id, context=None):
+    if context is not None:
+        return context.in_family(lang_id, URALIC)
     return lang_id in _URALIC_SET
-
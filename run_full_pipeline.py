@@ -39,6 +39,8 @@ TOOLS = PROJECT_ROOT / "tools"
 # Pipeline steps
 GENERATE_ISO_FILES = TOOLS / "generate_iso_files.py"
 BUILD_UNIFIED = PROJECT_ROOT / "build_unified.py"
+BUILD_FAMILY_ROLLUPS = TOOLS / "build_family_rollups.py"
+BUILD_POS_MATRIX = TOOLS / "build_pos_matrix.py"
 VALIDATE_BCP47 = TOOLS / "validate_bcp47.py"
 VALIDATE_FALLBACKS = TOOLS / "validate_fallbacks.py"
 VALIDATE_ISO = TOOLS / "validate_iso_consistency.py"
@@ -80,6 +82,8 @@ def main():
     steps = [
         ("Generate ISO files", GENERATE_ISO_FILES),
         ("Build unified database", BUILD_UNIFIED),
+        ("Build family rollups", BUILD_FAMILY_ROLLUPS),
+        ("Build POS matrix", BUILD_POS_MATRIX),
         ("Validate BCP-47 tags", VALIDATE_BCP47),
         ("Validate fallback chains", VALIDATE_FALLBACKS),
         ("Validate ISO consistency", VALIDATE_ISO),
@@ -30,22 +30,24 @@
 #
 
 import json
+import sys
 from pathlib import Path
 
 # --- Tiedostopolut ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 INPUT_FILE = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT_LANG_LIST = PROJECT_ROOT / "output" / "unified" / "all_languages_list.json"
 OUTPUT_ERRORS = PROJECT_ROOT / "output" / "unified" / "validation_errors.json"
 
-# --- Lataa unified data ---
-with open(INPUT_FILE, "r", encoding="utf-8") as f:
-    unified = json.load(f)
-
 errors = []
 all_langs_list = []
 
-for lang_id, lang in unified.items():
+# --- Käy unified data läpi virtana ---
+for lang_id, lang in iter_unified(INPUT_FILE):
     lang_entry = {
         "id": lang_id,
         "bcp47": lang.get("bcp47"),
@@ -89,7 +91,7 @@ with open(OUTPUT_LANG_LIST, "w", encoding="utf-8") as f:
 with open(OUTPUT_ERRORS, "w", encoding="utf-8") as f:
     json.dump(errors, f, ensure_ascii=False, indent=2)
 
-print(f"Validation finished: {len(unified)} languages checked.")
+print(f"Validation finished: {len(all_langs_list)} languages checked.")
 print(f"Errors found: {len(errors)}")
 print(f"All languages list saved to: {OUTPUT_LANG_LIST}")
 print(f"Validation errors saved to: {OUTPUT_ERRORS}")
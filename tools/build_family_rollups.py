@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "unified" / "family_rollups.json"
+
+
+def _lineage_of(info):
+    """
+    Kielen sukupolku juuresta lähimpään ryhmään.
+    Jos Glottolog-lineage puuttuu, käytetään pelkkää family-kenttää.
+    """
+    gl = info.get("glottolog") or {}
+    lineage = [x for x in (gl.get("lineage") or []) if x]
+    if lineage:
+        return lineage
+
+    family = info.get("family") or gl.get("family")
+    return [family] if family else []
+
+
+def _empty_totals():
+    return {"languages": 0, "written": 0, "uralicNLP": 0, "pos_stats": defaultdict(int)}
+
+
+def build_family_rollups(unified):
+    """
+    Kokoaa pos_stats-summat ja kielimäärät Glottolog-sukupuun jokaiseen
+    solmuun yhdellä post-order -läpikäynnillä. unified on sanakirja tai
+    (id, tietue) -parien virta (iter_unified).
+
+    Palauttaa rakenteen:
+    {
+        "Uralic": {
+            "parent": None,
+            "depth": 0,
+            "children": ["Finnic", ...],
+            "languages": 42, "written": 30, "uralicNLP": 42,
+            "pos_stats": {"noun": 12345, ...}
+        },
+        ...
+    }
+    """
+    parent = {}
+    children = defaultdict(set)
+    own = defaultdict(_empty_totals)
+
+    pairs = unified.items() if isinstance(unified, dict) else unified
+
+    # --- Rakenna puu ja kirjaa lehtien arvot lähimpään solmuun ---
+    for _, info in pairs:
+        lineage = _lineage_of(info)
+        if not lineage:
+            continue
+
+        for i, node in enumerate(lineage):
+            if i == 0:
+                parent.setdefault(node, None)
+            else:
+                # Ristiriitaisessa datassa ensimmäinen vanhempi voittaa,
+                # jotta mikään solmu ei tule lasketuksi kahdesti
+                if parent.setdefault(node, lineage[i - 1]) == lineage[i - 1]:
+                    children[lineage[i - 1]].add(node)
+
+        totals = own[lineage[-1]]
+        totals["languages"] += 1
+        if info.get("written"):
+            totals["written"] += 1
+        if info.get("uralicNLP"):
+            totals["uralicNLP"] += 1
+        for tag, count in (info.get("pos_stats") or {}).items():
+            if isinstance(count, int):
+                totals["pos_stats"][tag] += count
+
+    # --- Post-order: lapset ennen vanhempaa (iteratiivinen, ei rekursiota) ---
+    roots = sorted(node for node, p in parent.items() if p is None)
+    order = []
+    stack = [(root, False) for root in reversed(roots)]
+    seen = set()
+
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.append((node, True))
+        for child in sorted(children[node], reverse=True):
+            stack.append((child, False))
+
+    depth = {}
+    for node in reversed(order):
+        p = parent[node]
+        depth[node] = 0 if p is None else depth[p] + 1
+
+    rollups = {}
+    for node in order:
+        totals = own.get(node) or _empty_totals()
+        pos = defaultdict(int, totals["pos_stats"])
+        languages = totals["languages"]
+        written = totals["written"]
+        uralic = totals["uralicNLP"]
+
+        for child in children[node]:
+            c = rollups.get(child)
+            if c is None:
+                continue
+            languages += c["languages"]
+            written += c["written"]
+            uralic += c["uralicNLP"]
+            for tag, count in c["pos_stats"].items():
+                pos[tag] += count
+
+        rollups[node] = {
+            "parent": parent[node],
+            "depth": depth[node],
+            "children": sorted(children[node]),
+            "languages": languages,
+            "written": written,
+            "uralicNLP": uralic,
+            "pos_stats": dict(sorted(pos.items())),
+        }
+
+    return dict(sorted(rollups.items()))
+
+
+def load_family_rollups(path=OUTPUT):
+    if not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def family_totals(rollups, family):
+    """Suora haku: perheen tai alaryhmän kokonaissummat (tai None)."""
+    return rollups.get(family)
+
+
+def main():
+    rollups = build_family_rollups(iter_unified(UNIFIED))
+
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        json.dump(rollups, f, ensure_ascii=False, indent=2)
+
+    roots = sum(1 for r in rollups.values() if r["parent"] is None)
+    print(f"Family rollups: {len(rollups)} nodes ({roots} top-level families)")
+    print(f"Saved to: {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,11 +29,23 @@
 # SOFTWARE.
 #
 
+import argparse
 import json
 import os
-from pathlib import Path
+import sys
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path, PurePosixPath
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import atomic_write_bytes
+from loaders.json_stream import iter_json_array
+from loaders.load_glottolog import ISO_639_3_RE, crosswalk_from_glottolog, glottolog_record
+
 DATA_ROOT = PROJECT_ROOT / "data"
 
 # Input options
@@ -42,34 +54,149 @@ LANGUOIDS_TREE = DATA_ROOT / "languoids" / "tree"
 
 # Output
 OUTPUT = DATA_ROOT / "glottolog.json"
+CROSSWALK = DATA_ROOT / "glottolog_crosswalk.json"
+
+# md.ini -jäsennyksen välimuisti
+TREE_CACHE = DATA_ROOT / ".glottolog_tree_cache.json"
+TREE_CACHE_VERSION = 1
+
+def _iso_code(value):
+    """Palauttaa ISO 639-3 -koodin tai None (esim. hid = NOCODE_xxx)."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    return value if ISO_639_3_RE.match(value) else None
 
 
 def load_from_languoids_json():
     """
     Jos käytössä on valmiiksi koottu languoids.json (helppo tapa).
+    Tiedosto luetaan virtana alkio kerrallaan, joten muistin huippu
+    määräytyy tuloksesta eikä syötteen koosta.
     """
-    with open(LANGUOIDS_JSON, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-
     result = {}
 
-    for entry in raw:
+    for entry in iter_json_array(LANGUOIDS_JSON):
         code = entry.get("id")
         if not code:
             continue
 
-        result[code] = {
-            "macroarea": entry.get("macroarea"),
-            "latitude": entry.get("latitude"),
-            "longitude": entry.get("longitude"),
-            "lineage": entry.get("lineage", []),
-            "family": entry.get("family"),
-        }
+        iso = _iso_code(
+            entry.get("iso639_3")
+            or entry.get("iso639P3code")
+            or entry.get("iso")
+            or entry.get("hid")
+        )
+
+        result[code] = {**glottolog_record(entry), "iso639_3": iso}
+
+    return result
+
+
+def parse_md_ini(lines, code=None):
+    """
+    Jäsentää yhden md.ini -tiedoston rivit.
+    Palauttaa (glottocode, record) tai (None, None).
+    """
+    glotto = {}
+
+    for line in lines:
+        line = line.strip()
+
+        if line.startswith("id ="):
+            code = line.split("=", 1)[1].strip()
+
+        elif line.startswith("macroarea ="):
+            glotto["macroarea"] = line.split("=", 1)[1].strip()
+
+        elif line.startswith("latitude ="):
+            try:
+                glotto["latitude"] = float(line.split("=", 1)[1].strip())
+            except ValueError:
+                glotto["latitude"] = None
+
+        elif line.startswith("longitude ="):
+            try:
+                glotto["longitude"] = float(line.split("=", 1)[1].strip())
+            except ValueError:
+                glotto["longitude"] = None
+
+        elif line.startswith("family ="):
+            glotto["family"] = line.split("=", 1)[1].strip()
+
+        elif line.startswith("lineage ="):
+            lineage = line.split("=", 1)[1].strip()
+            glotto["lineage"] = [x.strip() for x in lineage.split(",")]
+
+        elif line.startswith("iso639-3 ="):
+            glotto["iso639_3"] = _iso_code(line.split("=", 1)[1])
+
+        elif line.startswith("hid ="):
+            glotto["hid"] = _iso_code(line.split("=", 1)[1])
+
+    if not code:
+        return None, None
+
+    return code, {
+        **glottolog_record(glotto),
+        "iso639_3": glotto.get("iso639_3") or glotto.get("hid"),
+    }
+
+
+def _parse_md_file(path):
+    # Glottologin puussa hakemiston nimi on glottocode
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_md_ini(f, Path(path).parent.name)
+
+
+def _parse_md_text(item):
+    name, text = item
+    return parse_md_ini(text.splitlines(), PurePosixPath(name).parent.name)
+
+
+# ---------------------------------------------------------
+# Jäsennysvälimuisti: polku → (mtime, koko, tulos)
+# ---------------------------------------------------------
+
+def _load_tree_cache(source_key):
+    if not TREE_CACHE.exists():
+        return {}
+    try:
+        with open(TREE_CACHE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != TREE_CACHE_VERSION or cache.get("source") != source_key:
+        return {}
+    return cache.get("entries", {})
 
+
+def _save_tree_cache(source_key, entries):
+    payload = {"version": TREE_CACHE_VERSION, "source": source_key, "entries": entries}
+    atomic_write_bytes(TREE_CACHE, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def _collect_records(parsed):
+    """Kokoaa tulokset deterministisessä (polku)järjestyksessä."""
+    result = {}
+    for _, code, record in sorted(parsed, key=lambda item: item[0]):
+        if not code:
+            continue
+        result[code] = record
     return result
 
 
-def load_from_tree():
+def _run_parallel(func, items, workers):
+    if not items:
+        return []
+    if workers == 1 or len(items) < 64:
+        return [func(item) for item in items]
+    chunksize = max(1, len(items) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
+
+
+def load_from_tree(workers=None, use_cache=True):
     """
     Jos käytössä on Glottologin raakapuuhakemisto languoids/tree/.
     Tämä lukee jokaisen md.ini -tiedoston ja poimii:
@@ -77,72 +204,122 @@ def load_from_tree():
     - macroarea
     - latitude, longitude
     - family lineage
+    - ISO 639-3 (iso639-3 tai hid)
+
+    Tiedostot jäsennetään prosessipoolissa. Välimuisti (polku, mtime,
+    koko) pitää huolen, että uusintaajo jäsentää vain muuttuneet tiedostot.
     """
+    source_key = f"tree:{LANGUOIDS_TREE}"
+    cache = _load_tree_cache(source_key) if use_cache else {}
 
-    result = {}
+    parsed = []
+    todo = []
+    entries = {}
 
     for root, dirs, files in os.walk(LANGUOIDS_TREE):
         if "md.ini" not in files:
             continue
 
-        md_path = Path(root) / "md.ini"
+        md_path = os.path.join(root, "md.ini")
+        rel = os.path.relpath(md_path, LANGUOIDS_TREE)
+        st = os.stat(md_path)
 
-        glotto = {}
-        code = None
+        hit = cache.get(rel)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            entries[rel] = hit
+            parsed.append((rel, hit[2], hit[3]))
+        else:
+            todo.append((rel, md_path, st.st_mtime_ns, st.st_size))
 
-        with open(md_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
+    results = _run_parallel(_parse_md_file, [item[1] for item in todo], workers)
 
-                if line.startswith("id ="):
-                    code = line.split("=", 1)[1].strip()
+    for (rel, _, mtime, size), (code, record) in zip(todo, results):
+        entries[rel] = [mtime, size, code, record]
+        parsed.append((rel, code, record))
 
-                elif line.startswith("macroarea ="):
-                    glotto["macroarea"] = line.split("=", 1)[1].strip()
+    print(f"md.ini files: {len(parsed)} total, {len(todo)} parsed, {len(parsed) - len(todo)} from cache")
 
-                elif line.startswith("latitude ="):
-                    try:
-                        glotto["latitude"] = float(line.split("=", 1)[1].strip())
-                    except:
-                        glotto["latitude"] = None
+    if use_cache:
+        _save_tree_cache(source_key, entries)
 
-                elif line.startswith("longitude ="):
-                    try:
-                        glotto["longitude"] = float(line.split("=", 1)[1].strip())
-                    except:
-                        glotto["longitude"] = None
+    return _collect_records(parsed)
 
-                elif line.startswith("family ="):
-                    glotto["family"] = line.split("=", 1)[1].strip()
 
-                elif line.startswith("lineage ="):
-                    lineage = line.split("=", 1)[1].strip()
-                    glotto["lineage"] = [x.strip() for x in lineage.split(",")]
+def _iter_archive_members(archive_path):
+    """
+    Käy läpi julkaisuarkiston (zip tai tar.*) languoids/tree/**/md.ini
+    -tiedostot purkamatta arkistoa levylle.
+    Tuottaa (nimi, mtime, koko, lue()) -nelikot.
+    """
+    archive_path = Path(archive_path)
 
-        if code:
-            result[code] = {
-                "macroarea": glotto.get("macroarea"),
-                "latitude": glotto.get("latitude"),
-                "longitude": glotto.get("longitude"),
-                "lineage": glotto.get("lineage", []),
-                "family": glotto.get("family"),
-            }
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if name.endswith("/md.ini") and "/languoids/tree/" in "/" + name:
+                    mtime = int(datetime(*info.date_time).timestamp())
+                    yield name, mtime, info.file_size, lambda info=info: zf.read(info)
+        return
 
-    return result
+    with tarfile.open(archive_path, "r:*") as tf:
+        for member in tf:
+            name = member.name
+            if member.isfile() and name.endswith("/md.ini") and "/languoids/tree/" in "/" + name:
+                yield name, int(member.mtime), member.size, lambda m=member: tf.extractfile(m).read()
 
 
-def build_glottolog():
+def load_from_archive(archive_path, workers=None, use_cache=True):
+    """
+    Lukee md.ini -tiedostot suoraan Glottologin julkaisuarkistosta
+    (esim. glottolog-5.0.zip tai .tar.gz). Välimuisti toimii kuten
+    load_from_tree():ssä, avaimena arkiston jäsenen nimi.
+    """
+    source_key = f"archive:{Path(archive_path).name}"
+    cache = _load_tree_cache(source_key) if use_cache else {}
+
+    parsed = []
+    todo = []
+    entries = {}
+
+    for name, mtime, size, read in _iter_archive_members(archive_path):
+        hit = cache.get(name)
+        if hit and hit[0] == mtime and hit[1] == size:
+            entries[name] = hit
+            parsed.append((name, hit[2], hit[3]))
+        else:
+            todo.append((name, mtime, size, read().decode("utf-8")))
+
+    results = _run_parallel(_parse_md_text, [(item[0], item[3]) for item in todo], workers)
+
+    for (name, mtime, size, _), (code, record) in zip(todo, results):
+        entries[name] = [mtime, size, code, record]
+        parsed.append((name, code, record))
+
+    print(f"md.ini files: {len(parsed)} total, {len(todo)} parsed, {len(parsed) - len(todo)} from cache")
+
+    if use_cache:
+        _save_tree_cache(source_key, entries)
+
+    return _collect_records(parsed)
+
+
+def build_glottolog(archive=None, workers=None, use_cache=True):
     """
     Valitsee automaattisesti oikean lähteen ja tuottaa glottolog.json.
     """
 
-    if LANGUOIDS_JSON.exists():
+    if archive:
+        print(f"Using Glottolog release archive {archive} as source...")
+        data = load_from_archive(archive, workers, use_cache)
+
+    elif LANGUOIDS_JSON.exists():
         print("Using languoids.json as source...")
         data = load_from_languoids_json()
 
     elif LANGUOIDS_TREE.exists():
         print("Using languoids/tree/ as source...")
-        data = load_from_tree()
+        data = load_from_tree(workers, use_cache)
 
     else:
         raise FileNotFoundError(
@@ -154,9 +331,32 @@ def build_glottolog():
     with open(OUTPUT, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+    # Sama törmäyssääntö kuin lataajan varapolussa
+    xwalk = crosswalk_from_glottolog(data)
+    print(
+        f"Saving glottolog_crosswalk.json → {CROSSWALK} "
+        f"({len(xwalk['iso_to_glottocode'])} ISO codes)"
+    )
+
+    for iso, codes in xwalk["collisions"].items():
+        print(f"Warning: ISO {iso} maps to several glottocodes: {', '.join(codes)} (using {codes[0]})")
+
+    with open(CROSSWALK, "w", encoding="utf-8") as f:
+        json.dump(xwalk, f, ensure_ascii=False, indent=2)
+
     print("Done.")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build data/glottolog.json.")
+    parser.add_argument("--archive", type=Path, help="Read md.ini files from a Glottolog release zip/tar")
+    parser.add_argument("--workers", type=int, help="Parser processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the parse cache")
+    args = parser.parse_args(argv)
+
+    build_glottolog(args.archive, args.workers, not args.no_cache)
+
+
 if __name__ == "__main__":
-    build_glottolog()
+    main()
 
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import math
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build_spatial_index import extract_points
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import atomic_write_bytes, compact_json_bytes, content_hash
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "tiles"
+
+MAX_ZOOM = 8
+# Klusteriruudukko yhden tiilen sisällä (GRID x GRID solua)
+CLUSTER_GRID = 16
+# Web Mercatorin leveysasteraja
+MAX_LAT = 85.05112878
+
+TILE_INDEX_VERSION = 2
+# Asiakasindeksin tiilitiivisteiden pituus (heksamerkkejä)
+HASH_LEN = 8
+# Tilatiedoston aiempi sijainti tiilihakemiston sisällä; siirretään pois
+LEGACY_STATE_FILE = ".state.json"
+
+
+# ---------------------------------------------------------
+# Web Mercator -tiiligeometria
+# ---------------------------------------------------------
+
+def project(lat, lon):
+    """(lat, lon) → normalisoidut Mercator-koordinaatit (x, y) välillä [0, 1)."""
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    # Pidetään rajat tiilialueen sisällä
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def tile_bounds(z, x, y):
+    """Tiilen rajat muodossa [west, south, east, north] asteina."""
+    n = 2 ** z
+
+    def lat_of(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return [x / n * 360.0 - 180.0, lat_of(y + 1), (x + 1) / n * 360.0 - 180.0, lat_of(y)]
+
+
+def tiles_in_view(zoom_tiles, west, south, east, north, zoom):
+    """
+    Palauttaa zoomaustason indeksistä (index/{z}.json: {"x/y": tiiviste})
+    ne tiiliavaimet "z/x/y", jotka leikkaavat näkymän. Asiakas hakee vain
+    tason indeksin ja nämä tiedostot.
+    """
+    n = 2 ** zoom
+
+    x0, y0 = project(north, west)
+    x1, y1 = project(south, east)
+    tx0, tx1 = int(x0 * n), int(x1 * n)
+    ty0, ty1 = int(y0 * n), int(y1 * n)
+
+    # Päivämäärärajan ylittävä näkymä
+    xs = range(tx0, tx1 + 1) if tx0 <= tx1 else list(range(tx0, n)) + list(range(0, tx1 + 1))
+
+    keys = []
+    for tx in xs:
+        for ty in range(ty0, ty1 + 1):
+            if f"{tx}/{ty}" in zoom_tiles:
+                keys.append(f"{zoom}/{tx}/{ty}")
+    return keys
+
+
+# ---------------------------------------------------------
+# Klusterointi
+# ---------------------------------------------------------
+
+def _dominant_family(points):
+    counts = Counter(p["family"] for p in points if p["family"])
+    if not counts:
+        return None
+    # Tasatilanteessa aakkosjärjestys → deterministinen
+    return min(counts.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+def _points_signature(points):
+    """Tiilen pisteiden sormenjälki muutostunnistusta varten."""
+    rows = sorted((p["id"], p["lat"], p["lon"], p["family"], p["macroarea"]) for p in points)
+    return content_hash(compact_json_bytes(rows))
+
+
+def build_tile(z, x, y, points, include_ids):
+    """Ryhmittelee tiilen pisteet CLUSTER_GRID-ruudukkoon."""
+    n = 2 ** z
+    cells = defaultdict(list)
+
+    for p in points:
+        px, py = project(p["lat"], p["lon"])
+        cx = int((px * n - x) * CLUSTER_GRID)
+        cy = int((py * n - y) * CLUSTER_GRID)
+        cells[(cx, cy)].append(p)
+
+    clusters = []
+    for cell in sorted(cells):
+        members = cells[cell]
+        cluster = {
+            "lat": round(sum(p["lat"] for p in members) / len(members), 5),
+            "lon": round(sum(p["lon"] for p in members) / len(members), 5),
+            "count": len(members),
+            "family": _dominant_family(members),
+        }
+        if include_ids:
+            cluster["ids"] = sorted(p["id"] for p in members)
+        clusters.append(cluster)
+
+    return {
+        "z": z,
+        "x": x,
+        "y": y,
+        "count": len(points),
+        "clusters": clusters,
+    }
+
+
+# ---------------------------------------------------------
+# Pyramidin rakentaminen
+# ---------------------------------------------------------
+
+def group_by_tile(points, max_zoom):
+    """{(z, x, y): [point, ...]} kaikille zoomaustasoille."""
+    tiles = defaultdict(list)
+    for p in points:
+        px, py = project(p["lat"], p["lon"])
+        for z in range(max_zoom + 1):
+            n = 2 ** z
+            tiles[(z, int(px * n), int(py * n))].append(p)
+    return tiles
+
+
+def _load_json(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_tile_index(output):
+    """Asiakkaan pääindeksi: {"version", "max_zoom", "grid", "zooms": {z: {...}}}."""
+    return _load_json(Path(output) / "index.json")
+
+
+def load_zoom_index(output, zoom):
+    """Yhden zoomaustason indeksi {"x/y": tiiviste} (tyhjä, jos tasoa ei ole)."""
+    index = load_tile_index(output)
+    if not index:
+        return {}
+    entry = index["zooms"].get(str(zoom))
+    if entry is None:
+        return {}
+    return _load_json(Path(output) / entry["file"]) or {}
+
+
+def state_path_of(output):
+    """
+    Palvelinpuolen muutostunnistustila julkaistavan hakemiston vieressä
+    (output/tiles → output/.tiles.state.json), jotta sitä ei jaeta asiakkaille.
+    """
+    output = Path(output)
+    return output.parent / f".{output.name}.state.json"
+
+
+def _tile_keys_on_disk(output):
+    """Levyllä olevien tiilien avaimet "z/x/y" (indeksitiedostot ohitetaan)."""
+    for path in Path(output).glob("*/*/*.json"):
+        z, x = path.parts[-3], path.parts[-2]
+        if z.isdigit() and x.isdigit() and path.stem.isdigit():
+            yield f"{z}/{x}/{path.stem}"
+
+
+def _remove_tile(output, key):
+    """Poistaa tiilen ja tyhjiksi jääneet x- ja z-hakemistot."""
+    path = Path(output) / f"{key}.json"
+    if not path.exists():
+        return False
+    path.unlink()
+    for parent in (path.parent, path.parent.parent):
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+    return True
+
+
+def build_map_tiles(unified_path=UNIFIED, output=OUTPUT, max_zoom=MAX_ZOOM, workers=8, state_path=None):
+    """
+    Tuottaa tiilipyramidin output/tiles/{z}/{x}/{y}.json.
+
+    Asiakkaalle jaetaan pieni index.json (zoomaustasot ja niiden
+    indeksitiedostot) sekä index/{z}.json = {"x/y": lyhyt tiiviste}, joten
+    asiakas lataa vain näkymänsä tason indeksin. Pisteiden sormenjäljet
+    muutostunnistusta varten ovat palvelinpuolen tilatiedostossa
+    (state_path_of, tiilihakemiston ulkopuolella). Vain tiilet, joiden pisteet muuttuivat,
+    kirjoitetaan uudelleen.
+
+    Jos tila puuttuu tai on eri versiolta, max_zoomilta tai ruudukolta,
+    kaikki tiilet rakennetaan uudelleen ja hakemistosta siivotaan jokainen
+    tiili, jota uudessa pyramidissa ei ole.
+    """
+    output = Path(output)
+    state_path = Path(state_path) if state_path else state_path_of(output)
+    legacy_state = output / LEGACY_STATE_FILE
+
+    points = extract_points(iter_unified(unified_path))
+    grouped = group_by_tile(points, max_zoom)
+
+    previous = _load_json(state_path) if state_path.exists() else _load_json(legacy_state)
+    matched = bool(previous) and previous.get("version") == TILE_INDEX_VERSION \
+        and previous.get("max_zoom") == max_zoom and previous.get("grid") == CLUSTER_GRID
+    prev_tiles = previous.get("tiles", {}) if matched else {}
+
+    state = {}
+    todo = []
+
+    for (z, x, y) in sorted(grouped):
+        key = f"{z}/{x}/{y}"
+        tile_points = grouped[(z, x, y)]
+        signature = _points_signature(tile_points)
+        state[key] = {"points": signature}
+
+        prev = prev_tiles.get(key)
+        # Keskeneräisessä tilassa tiiviste voi puuttua → rakennetaan uudelleen
+        if prev and prev.get("points") == signature and prev.get("hash") \
+                and (output / f"{key}.json").exists():
+            state[key]["hash"] = prev["hash"]
+            continue
+
+        todo.append((key, z, x, y, tile_points))
+
+    def write_tile(job):
+        key, z, x, y, tile_points = job
+        data = compact_json_bytes(build_tile(z, x, y, tile_points, include_ids=(z == max_zoom)))
+        atomic_write_bytes(output / f"{key}.json", data)
+        return key, content_hash(data)[:HASH_LEN]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, digest in pool.map(write_tile, todo):
+            state[key]["hash"] = digest
+
+    # Poista tiilet, joissa ei enää ole pisteitä. Ilman täsmäävää tilaa ei
+    # tiedetä, mitä aiemmin kirjoitettiin, joten käydään läpi koko hakemisto
+    removed = 0
+    stale_keys = prev_tiles if matched else list(_tile_keys_on_disk(output))
+    for key in stale_keys:
+        if key not in state and _remove_tile(output, key):
+            removed += 1
+
+    # Asiakasindeksit zoomaustasoittain
+    by_zoom = defaultdict(dict)
+    for key, entry in state.items():
+        z, xy = key.split("/", 1)
+        by_zoom[int(z)][xy] = entry["hash"]
+
+    zooms = {}
+    for z in sorted(by_zoom):
+        rel = f"index/{z}.json"
+        data = compact_json_bytes(by_zoom[z])
+        atomic_write_bytes(output / rel, data)
+        zooms[str(z)] = {"file": rel, "hash": content_hash(data)[:HASH_LEN], "tiles": len(by_zoom[z])}
+
+    for stale in (output / "index").glob("*.json"):
+        if stale.stem not in zooms:
+            stale.unlink()
+
+    index = {
+        "version": TILE_INDEX_VERSION,
+        "max_zoom": max_zoom,
+        "grid": CLUSTER_GRID,
+        "zooms": zooms,
+    }
+    atomic_write_bytes(output / "index.json", compact_json_bytes(index))
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(state_path, compact_json_bytes({
+        "version": TILE_INDEX_VERSION,
+        "max_zoom": max_zoom,
+        "grid": CLUSTER_GRID,
+        "tiles": state,
+    }))
+    if legacy_state.exists():
+        legacy_state.unlink()
+
+    print(f"Tiles: {len(state)} total, {len(todo)} written, {removed} removed")
+    print(f"Tile index written to: {output / 'index.json'}")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a pre-clustered map tile pyramid.")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--state", type=Path,
+                        help="Change-detection state file (default: next to the output directory)")
+    args = parser.parse_args(argv)
+
+    build_map_tiles(args.input, args.output, args.max_zoom, args.workers, args.state)
+
+
+if __name__ == "__main__":
+    main()
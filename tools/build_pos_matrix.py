@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_pos_stats import DATA, MATRIX, pos_matrix_from_stats, save_pos_matrix
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT_UNIFIED = PROJECT_ROOT / "output" / "unified" / "pos_stats_matrix.bin"
+
+
+def unified_pos_stats(path=UNIFIED):
+    """{lang_id: pos_stats} unified-datasta (load_pos_matrix(..., load_stats=...))."""
+    return {lang_id: info.get("pos_stats") or {} for lang_id, info in iter_unified(path)}
+
+
+def build_pos_matrix():
+    """
+    Tallentaa pos_stats-tilastot tiheänä kieli × POS -matriisina:
+    - data/pos_stats_matrix.bin       (pos_stats.json, Wiktextractin koodit)
+    - output/unified/pos_stats_matrix.bin (unified-data, ISO 639-3 -koodit)
+    """
+    if DATA.exists():
+        with open(DATA, "r", encoding="utf-8") as f:
+            stats = json.load(f)
+        matrix = pos_matrix_from_stats(stats)
+        save_pos_matrix(matrix, MATRIX, source=DATA)
+        print(f"POS matrix {matrix.shape[0]}x{matrix.shape[1]} saved to: {MATRIX}")
+
+    if UNIFIED.exists():
+        matrix = pos_matrix_from_stats(unified_pos_stats(UNIFIED))
+        save_pos_matrix(matrix, OUTPUT_UNIFIED, source=UNIFIED)
+        print(f"POS matrix {matrix.shape[0]}x{matrix.shape[1]} saved to: {OUTPUT_UNIFIED}")
+
+
+if __name__ == "__main__":
+    build_pos_matrix()
@@ -29,6 +29,7 @@
 # SOFTWARE.
 #
 
+import argparse
 import json
 import gzip
 from pathlib import Path
@@ -39,6 +40,7 @@ DATA_ROOT = PROJECT_ROOT / "data"
 
 # Wiktextract raw data
 WIKT_FILE = DATA_ROOT / "raw-wiktextract-data.jsonl.gz"
+WIKT_URL = "https://kaikki.org/dictionary/raw-wiktextract-data.jsonl.gz"
 
 # Output file
 OUTPUT = DATA_ROOT / "pos_stats.json"
@@ -88,6 +90,25 @@ def build_pos_stats():
     print("POS stats built successfully.")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build POS statistics from Wiktextract raw data.")
+    parser.add_argument("--download", nargs="?", const=WIKT_URL, metavar="URL",
+                        help="Download the raw dump first (resumable), default: kaikki.org")
+    parser.add_argument("--sha256", help="Expected SHA-256 of the downloaded dump (required with --download)")
+    parser.add_argument("--allow-unverified", action="store_true",
+                        help="Download without --sha256 (the dump is not verified)")
+    args = parser.parse_args(argv)
+
+    if args.download and not args.sha256 and not args.allow_unverified:
+        parser.error("--download requires --sha256 (or --allow-unverified)")
+
+    if args.download:
+        from download_large import download_large
+        download_large(args.download, WIKT_FILE, sha256=args.sha256, allow_unverified=args.allow_unverified)
+
     build_pos_stats()
 
+
+if __name__ == "__main__":
+    main()
+
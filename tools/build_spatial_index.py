@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import math
+import heapq
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "unified" / "spatial_index.json"
+
+# Maapallon keskisäde (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+INDEX_VERSION = 1
+
+
+# ---------------------------------------------------------
+# Geometria
+# ---------------------------------------------------------
+
+def to_unit_vector(lat, lon):
+    """Muuntaa (lat, lon) asteina 3-D yksikkövektoriksi."""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    """Isoympyräetäisyys kilometreinä (haversine)."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _chord_to_km(chord):
+    # Jänne yksikköpallolla → kaaren pituus
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km):
+    if km >= math.pi * EARTH_RADIUS_KM:
+        return 2.0
+    return 2 * math.sin(km / (2 * EARTH_RADIUS_KM))
+
+
+def _as_filter(value):
+    """None → ei suodatusta, str → {str}, iterable → set."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+# ---------------------------------------------------------
+# Pisteiden poiminta unified-datasta
+# ---------------------------------------------------------
+
+def extract_points(unified):
+    """
+    Poimii kielet, joilla on Glottolog-koordinaatit. unified on sanakirja
+    tai (id, tietue) -parien virta (iter_unified).
+    Palauttaa listan: [{"id", "lat", "lon", "family", "macroarea"}, ...]
+    """
+    points = []
+    pairs = unified.items() if isinstance(unified, dict) else unified
+
+    for lang_id, info in pairs:
+        gl = info.get("glottolog") or {}
+        lat = gl.get("latitude")
+        lon = gl.get("longitude")
+
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            continue
+        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+            continue
+
+        points.append({
+            "id": lang_id,
+            "lat": float(lat),
+            "lon": float(lon),
+            "family": info.get("family") or gl.get("family"),
+            "macroarea": gl.get("macroarea"),
+        })
+
+    return points
+
+
+# ---------------------------------------------------------
+# k-d -puu 3-D yksikkövektoreille
+# ---------------------------------------------------------
+
+class SpatialIndex:
+    """
+    Implisiittinen k-d -puu: pisteet on järjestetty niin, että välin
+    [lo, hi) mediaani (lo + hi) // 2 on solmu ja jakoakseli on syvyys % 3.
+    Tallennettu muoto on pelkkä järjestetty pistelista, joten lataus ei
+    vaadi puun uudelleenrakentamista.
+
+    Haut käyttävät jänne-etäisyyttä yksikköpallolla (monotoninen
+    isoympyräetäisyyden kanssa) ja palauttavat kilometrit.
+    """
+
+    def __init__(self, points):
+        self.points = points
+        self.vectors = [to_unit_vector(p["lat"], p["lon"]) for p in points]
+
+    def __len__(self):
+        return len(self.points)
+
+    # --- Rakentaminen ---
+
+    @classmethod
+    def build(cls, points):
+        items = [(to_unit_vector(p["lat"], p["lon"]), p) for p in points]
+        # Vakaa lähtöjärjestys → deterministinen tiedosto
+        items.sort(key=lambda item: item[1]["id"])
+
+        stack = [(0, len(items), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            axis = depth % 3
+            items[lo:hi] = sorted(items[lo:hi], key=lambda item: item[0][axis])
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+        index = cls.__new__(cls)
+        index.vectors = [item[0] for item in items]
+        index.points = [item[1] for item in items]
+        return index
+
+    @classmethod
+    def from_unified(cls, unified):
+        return cls.build(extract_points(unified))
+
+    # --- Tallennus ---
+
+    def save(self, path):
+        rows = [
+            [p["id"], p["lat"], p["lon"], p["family"], p["macroarea"]]
+            for p in self.points
+        ]
+        payload = {"version": INDEX_VERSION, "points": rows}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported spatial index version: {payload.get('version')}")
+
+        points = [
+            {"id": r[0], "lat": r[1], "lon": r[2], "family": r[3], "macroarea": r[4]}
+            for r in payload["points"]
+        ]
+        return cls(points)
+
+    # --- Haut ---
+
+    def _accepts(self, point, macroareas, families):
+        if macroareas is not None and point["macroarea"] not in macroareas:
+            return False
+        if families is not None and point["family"] not in families:
+            return False
+        return True
+
+    def nearest(self, lat, lon, k=1, macroarea=None, family=None):
+        """
+        k lähintä kieltä pisteestä (lat, lon).
+        Palauttaa listan [(point, km), ...] etäisyysjärjestyksessä.
+        """
+        if k <= 0 or not self.points:
+            return []
+
+        q = to_unit_vector(lat, lon)
+        macroareas = _as_filter(macroarea)
+        families = _as_filter(family)
+        vectors = self.vectors
+        points = self.points
+
+        # max-keko: (-d2, i)
+        heap = []
+
+        def visit(lo, hi, depth):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            v = vectors[mid]
+
+            if self._accepts(points[mid], macroareas, families):
+                d2 = (q[0] - v[0]) ** 2 + (q[1] - v[1]) ** 2 + (q[2] - v[2]) ** 2
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d2, mid))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, mid))
+
+            axis = depth % 3
+            diff = q[axis] - v[axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+
+            visit(near[0], near[1], depth + 1)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far[0], far[1], depth + 1)
+
+        visit(0, len(points), 0)
+
+        result = sorted((-neg_d2, i) for neg_d2, i in heap)
+        return [(points[i], _chord_to_km(math.sqrt(d2))) for d2, i in result]
+
+    def within_radius(self, lat, lon, radius_km, macroarea=None, family=None):
+        """
+        Kaikki kielet enintään radius_km päässä pisteestä (lat, lon).
+        Palauttaa listan [(point, km), ...] etäisyysjärjestyksessä.
+        """
+        if radius_km < 0 or not self.points:
+            return []
+
+        q = to_unit_vector(lat, lon)
+        max_d2 = _km_to_chord(radius_km) ** 2
+        macroareas = _as_filter(macroarea)
+        families = _as_filter(family)
+        vectors = self.vectors
+        points = self.points
+
+        found = []
+        stack = [(0, len(points), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            v = vectors[mid]
+
+            d2 = (q[0] - v[0]) ** 2 + (q[1] - v[1]) ** 2 + (q[2] - v[2]) ** 2
+            if d2 <= max_d2 and self._accepts(points[mid], macroareas, families):
+                found.append((d2, mid))
+
+            axis = depth % 3
+            diff = q[axis] - v[axis]
+            if diff < 0 or diff * diff <= max_d2:
+                stack.append((lo, mid, depth + 1))
+            if diff >= 0 or diff * diff <= max_d2:
+                stack.append((mid + 1, hi, depth + 1))
+
+        found.sort()
+        return [(points[i], _chord_to_km(math.sqrt(d2))) for d2, i in found]
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def build_spatial_index(unified_path=UNIFIED, output=OUTPUT):
+    index = SpatialIndex.from_unified(iter_unified(unified_path))
+    index.save(output)
+
+    print(f"Spatial index: {len(index)} languages with coordinates")
+    print(f"Saved to: {output}")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the Glottolog spatial index.")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    parser.add_argument("--near", nargs=2, type=float, metavar=("LAT", "LON"),
+                        help="Query the saved index instead of building it")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--radius", type=float, help="Radius query in kilometres")
+    parser.add_argument("--macroarea")
+    parser.add_argument("--family")
+    args = parser.parse_args(argv)
+
+    if not args.near:
+        build_spatial_index(args.input, args.output)
+        return
+
+    index = SpatialIndex.load(args.output)
+    lat, lon = args.near
+
+    if args.radius is not None:
+        hits = index.within_radius(lat, lon, args.radius, args.macroarea, args.family)
+    else:
+        hits = index.nearest(lat, lon, args.k, args.macroarea, args.family)
+
+    for point, km in hits:
+        print(f"{point['id']}\t{km:.1f} km\t{point['family'] or '-'}\t{point['macroarea'] or '-'}")
+
+
+if __name__ == "__main__":
+    main()
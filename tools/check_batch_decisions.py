@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from logic.batch_decisions import decide_columns
+from logic.build_context import BuildContext
+from logic.build_bcp47 import build_bcp47
+from logic.decide_default_region import decide_default_region
+from logic.decide_default_script import decide_default_script
+
+# Arvot, joihin skalaarisäännöissä on erikoistapauksia
+SCRIPTS = ["Latn", "Cyrl", "Arab", "UNKNOWN", "unknown", "", " ", None]
+REGIONS = ["FI", "RU", "001", "UNKNOWN", "unknown", "", " ", None]
+CODES = ["fi", "fin", "sv", "swe", "sme", "", "und", "xx"]
+
+
+def _tag(rng):
+    """Satunnainen CLDR-arvo, myös virheelliset muodot."""
+    kind = rng.random()
+    if kind < 0.1:
+        return rng.choice([None, 42, ["fi", "Latn"]])
+    parts = [rng.choice(CODES)] + [rng.choice(SCRIPTS[:6] + REGIONS[:6]) for _ in range(rng.randint(0, 3))]
+    return "-".join(parts)
+
+
+def _scripts(rng):
+    return [rng.choice(SCRIPTS[:-1]) for _ in range(rng.randint(0, 3))]
+
+
+def random_case(rng):
+    """Satunnainen kieli ja sen lähderivit."""
+    lang_id = rng.choice(CODES[:-1]) + rng.choice(["", "x"])
+
+    iso_info = {"iso639_3": lang_id}
+    r = rng.random()
+    if r < 0.5:
+        iso_info["iso639_1"] = rng.choice(CODES)
+    elif r < 0.6:
+        iso_info["iso639_1"] = None
+
+    w = {}
+    if rng.random() < 0.7:
+        if rng.random() < 0.6:
+            w["scripts"] = _scripts(rng)
+        if rng.random() < 0.6:
+            w["region"] = rng.choice(REGIONS)
+
+    written = {"scripts": _scripts(rng)} if rng.random() < 0.5 else {}
+    return lang_id, iso_info, w, written
+
+
+def random_cldr(rng):
+    return {code: _tag(rng) for code in CODES + [c + "x" for c in CODES] if rng.random() < 0.7}
+
+
+def check(cases, seed, batch_size=50):
+    """Vertaa eräpolkua skalaarifunktioihin. Palauttaa erojen listan."""
+    rng = random.Random(seed)
+    mismatches = []
+
+    for _ in range(max(1, cases // batch_size)):
+        cldr = random_cldr(rng)
+        rows = [random_case(rng) for _ in range(batch_size)]
+        context = rng.choice([
+            None,
+            BuildContext.create(),
+            BuildContext.create(fallback_script="Zyyy", fallback_region="ZZ"),
+        ])
+
+        columns = decide_columns(
+            [r[0] for r in rows], [r[1] for r in rows],
+            [r[2] for r in rows], [r[3] for r in rows], cldr, context=context,
+        )
+
+        for i, (lang_id, iso_info, w, written) in enumerate(rows):
+            script = decide_default_script(lang_id, w, cldr, written, iso_info, context)
+            region = decide_default_region(lang_id, w, cldr, iso_info, context)
+            expected = (script, region, build_bcp47(lang_id, script, region, iso_info))
+            got = (columns["default_script"][i], columns["default_region"][i], columns["bcp47"][i])
+
+            if got != expected:
+                mismatches.append({
+                    "lang_id": lang_id, "iso_info": iso_info, "wikt": w, "written": written,
+                    "cldr": {k: v for k, v in cldr.items() if k in (lang_id, iso_info.get("iso639_1"))},
+                    "expected": expected, "got": got,
+                })
+
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check batch decisions against the scalar logic functions.")
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mismatches = check(args.cases, args.seed)
+
+    if mismatches:
+        for m in mismatches[:10]:
+            print(m)
+        print(f"FAILED: {len(mismatches)} mismatches")
+        sys.exit(1)
+
+    print(f"OK: batch decisions match scalar functions ({args.cases} cases, seed {args.seed})")
+
+
+if __name__ == "__main__":
+    main()
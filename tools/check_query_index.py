@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from facet_index import FacetIndex
+from query_unified import Query
+
+from loaders.load_unified import UnifiedIndex
+from writers.unified_writers import open_writer
+
+_MISSING = object()
+
+# Arvot, joihin indeksillä on erikoistapauksia (None, "", totuusarvot, luvut)
+SCRIPTS = ["Latn", "Cyrl", "Arab", "", None]
+REGIONS = ["FI", "RU", "001", "", None]
+FAMILIES = ["Uralic", "Turkic", "Indo-European", "", None]
+MACROAREAS = ["Eurasia", "Africa", "", None]
+FLAGS = [True, False, None, 1, 0, ""]
+
+QUERY_FIELDS = {
+    "default_script": SCRIPTS,
+    "default_region": REGIONS,
+    "family": FAMILIES,
+    "macroarea": MACROAREAS,
+    "uralicNLP": FLAGS,
+    "written": FLAGS,
+}
+
+
+def _maybe(rng, record, key, values):
+    value = rng.choice(values + [_MISSING])
+    if value is not _MISSING:
+        record[key] = value
+
+
+def random_record(rng):
+    record = {}
+    _maybe(rng, record, "default_script", SCRIPTS)
+    _maybe(rng, record, "default_region", REGIONS)
+    _maybe(rng, record, "family", FAMILIES)
+    _maybe(rng, record, "uralicNLP", FLAGS)
+    _maybe(rng, record, "written", FLAGS)
+    if rng.random() < 0.8:
+        record["written_scripts"] = [rng.choice(SCRIPTS) for _ in range(rng.randint(0, 3))]
+    if rng.random() < 0.7:
+        gl = {}
+        _maybe(rng, gl, "macroarea", MACROAREAS)
+        _maybe(rng, gl, "family", FAMILIES)
+        record["glottolog"] = gl
+    return record
+
+
+def _literal(value):
+    if isinstance(value, list):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    return json.dumps(value)
+
+
+def random_atom(rng):
+    field = rng.choice(list(QUERY_FIELDS))
+    values = QUERY_FIELDS[field]
+    kind = rng.random()
+    if kind < 0.4:
+        return f"{field} = {_literal(rng.choice(values))}"
+    if kind < 0.55:
+        return f"{field} = {_literal([rng.choice(values)])}"
+    if kind < 0.75:
+        return f"{field} in {_literal(rng.sample(values, rng.randint(1, 3)))}"
+    if kind < 0.9:
+        return f"{_literal(rng.choice(SCRIPTS))} in written_scripts"
+    return rng.choice(["written", "uralicNLP"])
+
+
+def random_query(rng, depth=0):
+    if depth >= 2 or rng.random() < 0.4:
+        return random_atom(rng)
+    op = rng.choice([" and ", " or "])
+    parts = [random_query(rng, depth + 1) for _ in range(rng.randint(2, 3))]
+    text = "(" + op.join(parts) + ")"
+    return f"not {text}" if rng.random() < 0.15 else text
+
+
+def check(cases, seed, records=200):
+    """
+    Vertaa indeksin kautta ajettua kyselyä täyteen läpikäyntiin sekä
+    dictillä että offset-sivutiedoston kautta (UnifiedIndex).
+    """
+    rng = random.Random(seed)
+    mismatches = []
+
+    unified = {f"l{i:04d}": random_record(rng) for i in range(records)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Indeksi tallennetaan ja ladataan, kuten CLI:ssä
+        path = Path(tmp) / "facet_index.json"
+        FacetIndex.build(unified).save(path)
+        index = FacetIndex.load(path)
+
+        unified_path = Path(tmp) / "unified_languages.json"
+        with open_writer(unified_path, index=True) as writer:
+            writer.write_all(unified)
+
+        with UnifiedIndex(unified_path) as offsets:
+            for _ in range(cases):
+                text = random_query(rng)
+                query = Query(text)
+                scanned = [lang_id for lang_id, _ in query.run(unified)]
+                runs = {
+                    "index": query.run(unified, index),
+                    "offsets": query.run(offsets),
+                    "offsets+index": query.run(offsets, index),
+                }
+                for name, hits in runs.items():
+                    found = [lang_id for lang_id, _ in hits]
+                    if found != scanned:
+                        mismatches.append({"query": text, "via": name, "scan": scanned[:10], name: found[:10]})
+
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that facet-index query plans match full scans.")
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mismatches = check(args.cases, args.seed)
+
+    if mismatches:
+        for m in mismatches[:10]:
+            print(m)
+        print(f"FAILED: {len(mismatches)} mismatches")
+        sys.exit(1)
+
+    print(f"OK: facet index plans match full scans ({args.cases} queries, seed {args.seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import compact_json_bytes
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+
+FEED_VERSION = 1
+# Tiivisteen pituus tavuina (blake2b)
+DIGEST_SIZE = 16
+
+
+# ---------------------------------------------------------
+# Tiivisteet
+# ---------------------------------------------------------
+
+def record_hash(record):
+    """Tietueen tiiviste kanonisesta JSON-muodosta (kenttäjärjestys ei vaikuta)."""
+    return hashlib.blake2b(compact_json_bytes(record), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def changed_fields(old_record, new_record):
+    """(set, unset): muuttuneet/lisätyt kentät uusine arvoineen ja poistuneet kentät."""
+    changed = {
+        field: value for field, value in new_record.items()
+        if field not in old_record or compact_json_bytes(old_record[field]) != compact_json_bytes(value)
+    }
+    return changed, [field for field in old_record if field not in new_record]
+
+
+# ---------------------------------------------------------
+# Diff
+# ---------------------------------------------------------
+
+def iter_changes(old, new):
+    """
+    Vertaa kahta unified-aineistoa ja tuottaa muutokset yksi kerrallaan:
+
+      {"op": "add",    "id", "hash", "record"}
+      {"op": "change", "id", "from", "to", "set": {kenttä: uusi arvo}, "unset": [kenttä, ...]}
+      {"op": "remove", "id", "from"}
+      {"op": "summary", "added", "changed", "removed", "unchanged"}  (viimeisenä)
+
+    old ja new ovat iteroitavia (lang_id, tietue) -pareja. Vanha aineisto
+    pidetään muistissa tiivisteineen; uusi käydään läpi virtana, ja
+    jokainen tietue serialisoidaan kerran tiivistettäväksi. Kenttätason
+    vertailu tehdään vain, jos tietueen tiiviste poikkeaa. "from"/"to"
+    ovat record_hash-tiivisteitä, joilla apply_changes voi varmistaa, että
+    patch kohdistuu oikeaan versioon.
+    """
+    previous = {lang_id: (record_hash(record), record) for lang_id, record in old}
+    seen = set()
+    added = changed = unchanged = 0
+
+    for lang_id, record in new:
+        seen.add(lang_id)
+        digest = record_hash(record)
+        before = previous.get(lang_id)
+
+        if before is None:
+            added += 1
+            yield {"op": "add", "id": lang_id, "hash": digest, "record": record}
+            continue
+
+        old_digest, old_record = before
+        if old_digest == digest:
+            unchanged += 1
+            continue
+
+        changed += 1
+        set_fields, unset_fields = changed_fields(old_record, record)
+        yield {
+            "op": "change",
+            "id": lang_id,
+            "from": old_digest,
+            "to": digest,
+            "set": set_fields,
+            "unset": unset_fields,
+        }
+
+    removed = 0
+    for lang_id, (old_digest, _) in previous.items():
+        if lang_id not in seen:
+            removed += 1
+            yield {"op": "remove", "id": lang_id, "from": old_digest}
+
+    yield {
+        "op": "summary",
+        "version": FEED_VERSION,
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": unchanged,
+    }
+
+
+def diff_unified(old_path, new_path):
+    """iter_changes kahdelle unified-tiedostolle (mikä tahansa tuettu muoto)."""
+    return iter_changes(iter_unified(old_path), iter_unified(new_path))
+
+
+def write_change_feed(changes, output):
+    """Kirjoittaa muutokset JSONL-syötteeksi (yksi muutos per rivi)."""
+    summary = None
+    with open(output, "w", encoding="utf-8") as f:
+        for change in changes:
+            f.write(json.dumps(change, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            if change["op"] == "summary":
+                summary = change
+    return summary
+
+
+def iter_change_feed(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ---------------------------------------------------------
+# Patchin soveltaminen
+# ---------------------------------------------------------
+
+# apply_changes: poistettavaksi merkitty kieli
+_REMOVED = object()
+
+
+class PatchConflict(ValueError):
+    pass
+
+
+def apply_changes(unified, changes, verify=True):
+    """
+    Soveltaa muutossyötteen dictiin {lang_id: tietue} ja palauttaa sen.
+    changes = iter_changes-tuloste tai iter_change_feed(polku).
+
+    verify=True tarkistaa jokaisen muutoksen kohdalla, että kohdetietueen
+    tiiviste vastaa syötteen "from"-arvoa (tai että lisättävää kieltä ei
+    vielä ole), ja nostaa PatchConflict-virheen, jos välimuisti ei ole
+    siinä versiossa, josta syöte laskettiin.
+
+    Koko syöte tarkistetaan ennen kuin unified-dictiin kosketaan, joten
+    PatchConflict jättää sen ennalleen.
+    """
+    pending = {}
+    steps = []
+
+    def current(lang_id):
+        record = pending[lang_id] if lang_id in pending else unified.get(lang_id)
+        return None if record is _REMOVED else record
+
+    for change in changes:
+        op = change["op"]
+        lang_id = change.get("id")
+
+        if op == "add":
+            if verify and current(lang_id) is not None:
+                raise PatchConflict(f"{lang_id}: already present")
+            record = change["record"]
+
+        elif op == "change":
+            record = current(lang_id)
+            if record is None:
+                raise PatchConflict(f"{lang_id}: missing")
+            if verify and record_hash(record) != change["from"]:
+                raise PatchConflict(f"{lang_id}: record does not match the feed base")
+            record = dict(record)
+            for field in change["unset"]:
+                record.pop(field, None)
+            record.update(change["set"])
+
+        elif op == "remove":
+            record = current(lang_id)
+            if verify and (record is None or record_hash(record) != change["from"]):
+                raise PatchConflict(f"{lang_id}: record does not match the feed base")
+            record = _REMOVED
+
+        else:
+            continue
+
+        pending[lang_id] = record
+        steps.append((lang_id, record))
+
+    for lang_id, record in steps:
+        if record is _REMOVED:
+            unified.pop(lang_id, None)
+        else:
+            unified[lang_id] = record
+
+    return unified
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Structural diff between two unified builds.")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path, nargs="?", default=UNIFIED)
+    parser.add_argument("--output", "-o", type=Path,
+                        help="Write the JSONL change feed here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    changes = diff_unified(args.old, args.new)
+
+    if args.output:
+        summary = write_change_feed(changes, args.output)
+        elapsed = time.perf_counter() - start
+        print(f"Added: {summary['added']}, changed: {summary['changed']}, "
+              f"removed: {summary['removed']}, unchanged: {summary['unchanged']} ({elapsed:.2f} s)")
+        print(f"Change feed written to: {args.output}")
+        return
+
+    for change in changes:
+        sys.stdout.write(json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+if __name__ == "__main__":
+    main()
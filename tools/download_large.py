@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.fetch_sources import USER_AGENT
+from loaders.file_utils import atomic_write_bytes, file_stamp, sha256_file
+
+SEGMENTS = 8
+BLOCK_SIZE = 1024 * 1024
+TIMEOUT = 60
+# Segmentin uusintayritykset ennen kuin koko lataus keskeytetään
+RETRIES = 3
+# Edistymistila tallennetaan enintään näin usein (sekuntia)
+STATE_INTERVAL = 1.0
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+class ResourceChanged(DownloadError):
+    """Palvelin vastasi Range-pyyntöön koko tiedostolla (If-Range ei täsmännyt)."""
+
+
+def _validator(info):
+    """Version tunniste If-Range-otsakkeeseen: ETag, muuten Last-Modified."""
+    return info.get("etag") or info.get("last_modified")
+
+
+def _same_version(saved, info):
+    """
+    Onko palvelimen tiedosto sama versio kuin tallennettu? Ilman ETagia
+    verrataan Last-Modifiediä; ilman kumpaakaan versiota ei voi tunnistaa.
+    """
+    if saved.get("url") != info.get("url") or saved.get("size") != info.get("size"):
+        return False
+    if info.get("etag") or saved.get("etag"):
+        return saved.get("etag") == info.get("etag")
+    return info.get("last_modified") is not None and saved.get("last_modified") == info["last_modified"]
+
+
+def _request(url, headers=None, method="GET"):
+    h = {"User-Agent": USER_AGENT}
+    h.update(headers or {})
+    return urllib.request.Request(url, headers=h, method=method)
+
+
+def probe(url, timeout=TIMEOUT):
+    """
+    Selvittää koon, ETagin, Last-Modifiedin ja Range-tuen.
+    Palauttaa {"url", "size", "etag", "last_modified", "ranges"}.
+    """
+    try:
+        with urllib.request.urlopen(_request(url, method="HEAD"), timeout=timeout) as r:
+            size = r.headers.get("Content-Length")
+            return {
+                "url": url,
+                "size": int(size) if size is not None else None,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "ranges": r.headers.get("Accept-Ranges", "").lower() == "bytes",
+            }
+    except urllib.error.HTTPError as e:
+        if e.code not in (405, 501):
+            raise DownloadError(f"HEAD {url}: HTTP {e.code}") from e
+
+    # HEAD ei tuettu → yhden tavun Range-pyyntö
+    with urllib.request.urlopen(_request(url, {"Range": "bytes=0-0"}), timeout=timeout) as r:
+        content_range = r.headers.get("Content-Range", "")
+        size = None
+        if r.status == 206 and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            size = int(total) if total.isdigit() else None
+        elif r.headers.get("Content-Length"):
+            size = int(r.headers["Content-Length"])
+        return {
+            "url": url,
+            "size": size,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "ranges": r.status == 206,
+        }
+
+
+def _plan_segments(size, segments):
+    step = max(BLOCK_SIZE, -(-size // segments))
+    return [
+        {"start": start, "end": min(start + step, size) - 1, "pos": start}
+        for start in range(0, size, step)
+    ]
+
+
+class _State:
+    """Segmenttien edistyminen .part.json-tiedostossa (jatkamista varten)."""
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self.lock = threading.Lock()
+        self._saved = 0.0
+
+    @classmethod
+    def load_or_create(cls, path, part, url, info, segments):
+        if path.exists() and part.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if _same_version(data, info) and part.stat().st_size == info["size"]:
+                    return cls(path, data)
+            except (OSError, ValueError):
+                pass
+
+        with open(part, "wb") as f:
+            f.truncate(info["size"])
+
+        state = cls(path, {
+            "url": url,
+            "size": info["size"],
+            "etag": info["etag"],
+            "last_modified": info["last_modified"],
+            "segments": _plan_segments(info["size"], segments),
+        })
+        state.save(force=True)
+        return state
+
+    def advance(self, segment, pos):
+        with self.lock:
+            segment["pos"] = pos
+        self.save()
+
+    def save(self, force=False):
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self._saved < STATE_INTERVAL:
+                return
+            self._saved = now
+            atomic_write_bytes(self.path, json.dumps(self.data).encode("utf-8"))
+
+    @property
+    def remaining(self):
+        return sum(s["end"] + 1 - s["pos"] for s in self.data["segments"])
+
+
+def _fetch_segment(url, part, segment, state, timeout):
+    if segment["pos"] > segment["end"]:
+        return
+
+    headers = {"Range": f"bytes={segment['pos']}-{segment['end']}"}
+    # If-Range: jos tiedosto on muuttunut palvelimella, saadaan 200 eikä 206
+    validator = _validator(state.data)
+    if validator:
+        headers["If-Range"] = validator
+
+    with urllib.request.urlopen(_request(url, headers), timeout=timeout) as r:
+        if r.status != 206:
+            raise ResourceChanged(f"Server ignored Range request (HTTP {r.status}); file changed?")
+
+        with open(part, "r+b") as f:
+            f.seek(segment["pos"])
+            pos = segment["pos"]
+            while pos <= segment["end"]:
+                chunk = r.read(min(BLOCK_SIZE, segment["end"] + 1 - pos))
+                if not chunk:
+                    break
+                f.write(chunk)
+                pos += len(chunk)
+                # Data kirjoitetaan ennen tilaa → tila ei koskaan ole edellä
+                f.flush()
+                state.advance(segment, pos)
+
+    if segment["pos"] <= segment["end"]:
+        raise DownloadError(f"Connection closed at byte {segment['pos']}")
+
+
+def _fetch_segment_retrying(url, part, segment, state, timeout):
+    for attempt in range(RETRIES + 1):
+        try:
+            return _fetch_segment(url, part, segment, state, timeout)
+        except (OSError, DownloadError) as e:
+            # Muuttunut tiedosto ei korjaannu yrittämällä uudelleen
+            if attempt == RETRIES or isinstance(e, ResourceChanged):
+                raise
+            print(f"  segment {segment['start']}: {e}, retrying from byte {segment['pos']}...")
+            time.sleep(1 + attempt)
+
+
+def _download_single(url, part, timeout):
+    """Varapolku palvelimille ilman Range-tukea (ei jatkamista)."""
+    with urllib.request.urlopen(_request(url), timeout=timeout) as r, open(part, "wb") as f:
+        for chunk in iter(lambda: r.read(BLOCK_SIZE), b""):
+            f.write(chunk)
+
+
+def _load_meta(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def download_large(url, dest, sha256=None, segments=SEGMENTS, workers=None, timeout=TIMEOUT,
+                   allow_unverified=False):
+    """
+    Lataa suuren tiedoston rinnakkaisina tavualueina.
+
+    - Edistyminen tallennetaan tiedostoon <dest>.part.json, joten
+      keskeytynyt lataus jatkuu siitä mihin jäätiin. Jatkaminen vaatii,
+      että palvelimen ETag (tai sen puuttuessa Last-Modified) on ennallaan.
+    - Valmis tiedosto tarkistetaan sha256-summaa vasten ennen kuin se
+      siirretään paikalleen; virheellistä tiedostoa ei koskaan käytetä.
+      Ilman sha256:ta lataus vaatii allow_unverified=True.
+    - <dest>.meta.json kirjaa koon, ETagin, Last-Modifiedin ja sha256:n,
+      joten olemassa oleva tiedosto käytetään uudelleen ilman uutta
+      latausta tai koko tiedoston tiivistämistä.
+    """
+    if not sha256 and not allow_unverified:
+        raise DownloadError(f"No sha256 given for {url}; pass one or allow_unverified=True")
+
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    state_path = dest.with_name(dest.name + ".part.json")
+    meta_path = dest.with_name(dest.name + ".meta.json")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    sha256 = sha256.lower() if sha256 else None
+
+    meta = _load_meta(meta_path) if dest.exists() else None
+    if meta is not None and meta.get("stamp") != file_stamp(dest):
+        meta = None
+
+    if sha256:
+        if meta is not None and meta.get("sha256") == sha256:
+            print(f"{dest} already present and verified.")
+            return dest
+        if dest.exists() and sha256_file(dest) == sha256:
+            print(f"{dest} already present and verified.")
+            return dest
+
+    info = probe(url, timeout)
+
+    if not sha256 and meta is not None and _same_version(meta, info):
+        print(f"{dest} already present and unchanged on the server (not verified, sha256 {meta['sha256']}).")
+        return dest
+
+    if not info["ranges"] or not info["size"]:
+        print(f"Server does not support Range requests, downloading {url} in one stream...")
+        _download_single(url, part, timeout)
+    else:
+        state = _State.load_or_create(state_path, part, url, info, segments)
+        todo = [s for s in state.data["segments"] if s["pos"] <= s["end"]]
+        done = info["size"] - state.remaining
+        print(
+            f"Downloading {url}: {info['size']} bytes in {len(state.data['segments'])} segments"
+            + (f", resuming at {done} bytes" if done else "")
+        )
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers or segments) as pool:
+                for future in [pool.submit(_fetch_segment_retrying, url, part, s, state, timeout) for s in todo]:
+                    future.result()
+        finally:
+            state.save(force=True)
+
+    digest = sha256_file(part)
+    if sha256 and digest != sha256:
+        part.unlink()
+        if state_path.exists():
+            state_path.unlink()
+        raise DownloadError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+
+    os.replace(part, dest)
+    if state_path.exists():
+        state_path.unlink()
+
+    atomic_write_bytes(meta_path, json.dumps({
+        "url": url,
+        "size": info["size"],
+        "etag": info["etag"],
+        "last_modified": info["last_modified"],
+        "sha256": digest,
+        "stamp": file_stamp(dest),
+    }).encode("utf-8"))
+
+    print(f"Saved to {dest}")
+    if not sha256:
+        print(
+            f"WARNING: {dest} was NOT verified against a published checksum.\n"
+            f"         sha256 {digest}; pass --sha256 {digest} to pin this version."
+        )
+    return dest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumable parallel download of large artifacts.")
+    parser.add_argument("url")
+    parser.add_argument("dest", type=Path)
+    parser.add_argument("--sha256", help="Expected SHA-256 of the complete file (required)")
+    parser.add_argument("--allow-unverified", action="store_true",
+                        help="Download without --sha256 (the file is not verified)")
+    parser.add_argument("--segments", type=int, default=SEGMENTS)
+    args = parser.parse_args(argv)
+
+    if not args.sha256 and not args.allow_unverified:
+        parser.error("--sha256 is required (or pass --allow-unverified)")
+
+    download_large(args.url, args.dest, args.sha256, args.segments, allow_unverified=args.allow_unverified)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import DEFAULT_FILE_MODE
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "unified" / "unified_languages.sqlite"
+
+SCHEMA_VERSION = 1
+BATCH_SIZE = 5000
+
+LANGUAGE_COLUMNS = [
+    "id", "name", "official_name",
+    "iso639_1", "iso639_2B", "iso639_2T", "iso639_3", "iso639_5",
+    "default_script", "default_region", "bcp47", "fallback",
+    "uralicNLP", "written", "glottocode", "family",
+    "macroarea", "latitude", "longitude", "glottolog_family",
+]
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE languages (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    official_name TEXT,
+    iso639_1 TEXT,
+    iso639_2B TEXT,
+    iso639_2T TEXT,
+    iso639_3 TEXT,
+    iso639_5 TEXT,
+    default_script TEXT,
+    default_region TEXT,
+    bcp47 TEXT,
+    fallback TEXT,
+    uralicNLP INTEGER NOT NULL,
+    written INTEGER NOT NULL,
+    glottocode TEXT,
+    family TEXT,
+    macroarea TEXT,
+    latitude REAL,
+    longitude REAL,
+    glottolog_family TEXT
+);
+CREATE TABLE written_scripts (
+    lang_id TEXT NOT NULL REFERENCES languages(id),
+    position INTEGER NOT NULL,
+    script TEXT NOT NULL,
+    PRIMARY KEY (lang_id, position)
+);
+CREATE TABLE lineage (
+    lang_id TEXT NOT NULL REFERENCES languages(id),
+    depth INTEGER NOT NULL,
+    node TEXT NOT NULL,
+    PRIMARY KEY (lang_id, depth)
+);
+CREATE TABLE aliases (
+    lang_id TEXT NOT NULL REFERENCES languages(id),
+    alias TEXT NOT NULL
+);
+CREATE TABLE macrolanguages (
+    lang_id TEXT NOT NULL REFERENCES languages(id),
+    macrolanguage TEXT NOT NULL
+);
+CREATE TABLE pos_stats (
+    lang_id TEXT NOT NULL REFERENCES languages(id),
+    tag TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (lang_id, tag)
+);
+"""
+
+# Indeksit luodaan vasta datan lataamisen jälkeen (nopeampi)
+INDEXES = [
+    "CREATE INDEX idx_languages_iso639_1 ON languages(iso639_1)",
+    "CREATE INDEX idx_languages_iso639_2B ON languages(iso639_2B)",
+    "CREATE INDEX idx_languages_iso639_2T ON languages(iso639_2T)",
+    "CREATE INDEX idx_languages_iso639_3 ON languages(iso639_3)",
+    "CREATE INDEX idx_languages_iso639_5 ON languages(iso639_5)",
+    "CREATE INDEX idx_languages_bcp47 ON languages(bcp47)",
+    "CREATE INDEX idx_languages_glottocode ON languages(glottocode)",
+    "CREATE INDEX idx_languages_family ON languages(family)",
+    "CREATE INDEX idx_languages_macroarea ON languages(macroarea)",
+    "CREATE INDEX idx_written_scripts_script ON written_scripts(script)",
+    "CREATE INDEX idx_lineage_node ON lineage(node)",
+    "CREATE INDEX idx_aliases_lang ON aliases(lang_id)",
+    "CREATE INDEX idx_aliases_alias ON aliases(alias)",
+    "CREATE INDEX idx_macrolanguages_lang ON macrolanguages(lang_id)",
+    "CREATE INDEX idx_macrolanguages_macro ON macrolanguages(macrolanguage)",
+    "CREATE INDEX idx_pos_stats_tag ON pos_stats(tag)",
+]
+
+FTS_SCHEMA = "CREATE VIRTUAL TABLE names_fts USING fts5(lang_id UNINDEXED, kind UNINDEXED, text)"
+
+
+def _code(value):
+    # Tyhjä koodi → NULL, jotta indeksihaut eivät osu tyhjiin merkkijonoihin
+    return value or None
+
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def load_iso_extras():
+    """
+    Aliakset ja makrokielet ISO-lataajasta: {lang_id: (aliases, macrolanguages)}.
+    Unified-tietueissa niitä ei ole; jos ISO-moduuleja ei ole generoitu,
+    palautetaan tyhjä.
+    """
+    try:
+        from loaders.load_iso_639 import load_iso_639
+    except ImportError:
+        print("Warning: ISO modules not generated, aliases and macrolanguages not exported")
+        return {}
+
+    return {
+        code: (info.get("aliases") or [], info.get("macrolanguages") or [])
+        for code, info in load_iso_639().items()
+    }
+
+
+def _rows(lang_id, info, extras):
+    """Yhden kielen rivit tauluittain."""
+    gl = info.get("glottolog") or {}
+
+    language = (
+        lang_id,
+        info.get("name"),
+        info.get("official_name"),
+        _code(info.get("iso639_1")),
+        _code(info.get("iso639_2B")),
+        _code(info.get("iso639_2T")),
+        _code(info.get("iso639_3")),
+        _code(info.get("iso639_5")),
+        _code(info.get("default_script")),
+        _code(info.get("default_region")),
+        _code(info.get("bcp47")),
+        _code(info.get("fallback")),
+        int(bool(info.get("uralicNLP"))),
+        int(bool(info.get("written"))),
+        _code(info.get("glottocode")),
+        info.get("family") or gl.get("family"),
+        gl.get("macroarea"),
+        gl.get("latitude"),
+        gl.get("longitude"),
+        gl.get("family"),
+    )
+
+    aliases, macros = extras.get(lang_id, ((), ()))
+    names = [("name", info.get("name")), ("official_name", info.get("official_name"))]
+    names += [("alias", a) for a in aliases]
+
+    return {
+        "languages": [language],
+        "written_scripts": [(lang_id, i, s) for i, s in enumerate(info.get("written_scripts") or []) if s],
+        "lineage": [(lang_id, i, node) for i, node in enumerate(gl.get("lineage") or []) if node],
+        "aliases": [(lang_id, a) for a in dict.fromkeys(aliases) if a],
+        "macrolanguages": [(lang_id, m) for m in dict.fromkeys(macros) if m],
+        "pos_stats": [
+            (lang_id, tag, count)
+            for tag, count in sorted((info.get("pos_stats") or {}).items())
+            if isinstance(count, int)
+        ],
+        "names_fts": [(lang_id, kind, text) for kind, text in dict.fromkeys(names) if text],
+    }
+
+
+INSERTS = {
+    "languages": f"INSERT INTO languages VALUES ({', '.join('?' * len(LANGUAGE_COLUMNS))})",
+    "written_scripts": "INSERT INTO written_scripts VALUES (?, ?, ?)",
+    "lineage": "INSERT INTO lineage VALUES (?, ?, ?)",
+    "aliases": "INSERT INTO aliases VALUES (?, ?)",
+    "macrolanguages": "INSERT INTO macrolanguages VALUES (?, ?)",
+    "pos_stats": "INSERT INTO pos_stats VALUES (?, ?, ?)",
+    "names_fts": "INSERT INTO names_fts VALUES (?, ?, ?)",
+}
+
+
+def export_sqlite(unified_path=UNIFIED, output=OUTPUT, fts=True):
+    """
+    Kirjoittaa unified-datan normalisoituun SQLite-tietokantaan.
+    Kaikki rivit ladataan yhdessä transaktiossa valmiilla lauseilla
+    (executemany), indeksit luodaan lopuksi, ja valmis tiedosto
+    vaihdetaan paikalleen atomisesti.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    extras = load_iso_extras()
+
+    fd, tmp = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    os.close(fd)
+    conn = sqlite3.connect(tmp, isolation_level=None)
+
+    try:
+        # Väliaikaistiedosto: ei tarvetta journalille eikä fsyncille
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+
+        if fts and not fts5_available(conn):
+            print("Warning: FTS5 not available, names_fts not created")
+            fts = False
+        if fts:
+            conn.execute(FTS_SCHEMA)
+
+        tables = [t for t in INSERTS if fts or t != "names_fts"]
+        batches = {t: [] for t in tables}
+        count = 0
+
+        conn.execute("BEGIN")
+
+        for lang_id, info in iter_unified(unified_path):
+            for table, rows in _rows(lang_id, info, extras).items():
+                if table in batches:
+                    batches[table].extend(rows)
+            count += 1
+
+            if count % BATCH_SIZE == 0:
+                for table, rows in batches.items():
+                    conn.executemany(INSERTS[table], rows)
+                    rows.clear()
+
+        for table, rows in batches.items():
+            conn.executemany(INSERTS[table], rows)
+
+        for statement in INDEXES:
+            conn.execute(statement)
+
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("schema_version", str(SCHEMA_VERSION)),
+            ("source", Path(unified_path).name),
+            ("languages", str(count)),
+            ("fts", "1" if fts else "0"),
+        ])
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        conn.close()
+
+        os.chmod(tmp, DEFAULT_FILE_MODE)
+        os.replace(tmp, output)
+    except BaseException:
+        conn.close()
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    print(f"SQLite export: {count} languages in {time.perf_counter() - start:.2f}s")
+    print(f"Saved to: {output}")
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export unified language data to SQLite.")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    parser.add_argument("--no-fts", action="store_true", help="Skip the FTS5 name search table")
+    args = parser.parse_args(argv)
+
+    export_sqlite(args.input, args.output, fts=not args.no_fts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import atomic_write_bytes, compact_json_bytes, content_hash
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "static"
+
+MANIFEST_VERSION = 1
+# ID-etuliiteshardin pituus ("fi" → prefix/fi.json)
+PREFIX_LEN = 2
+# Manifestin tiivisteiden pituus (heksamerkkejä)
+HASH_LEN = 12
+UNKNOWN_FAMILY = "_unknown"
+
+
+def slug(value):
+    """Tiedostonimeksi kelpaava muoto: "Indo-European" → "indo-european"."""
+    s = re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-")
+    return s or "_"
+
+
+def _safe_name(lang_id):
+    return lang_id if re.fullmatch(r"[A-Za-z0-9_-]+", lang_id) else slug(lang_id)
+
+
+def prefix_of(lang_id):
+    return lang_id[:PREFIX_LEN].lower()
+
+
+def _family_of(info):
+    return info.get("family") or (info.get("glottolog") or {}).get("family") or UNKNOWN_FAMILY
+
+
+def plan_files(unified):
+    """
+    Palauttaa {suhteellinen polku: sisältö}:
+      lang/{id}.json         yksi kieli
+      family/{slug}.json     {id: tietue} perheittäin
+      prefix/{xx}.json       {id: tietue} ID-etuliitteittäin
+    sekä polut kielittäin, perheittäin ja etuliitteittäin.
+    """
+    files = {}
+    lang_files = {}
+    families = defaultdict(dict)
+    prefixes = defaultdict(dict)
+
+    for lang_id, info in unified:
+        name = _safe_name(lang_id)
+        rel = f"lang/{name}.json"
+        # Nimitörmäys (vain epätavallisilla ID:illä) → numerosuffiksi
+        n = 1
+        while rel in files:
+            n += 1
+            rel = f"lang/{name}-{n}.json"
+        files[rel] = info
+        lang_files[lang_id] = rel
+
+        families[_family_of(info)][lang_id] = info
+        prefixes[prefix_of(lang_id)][lang_id] = info
+
+    family_files = {}
+    for family in sorted(families):
+        rel = f"family/{slug(family)}.json"
+        n = 1
+        while rel in files:
+            n += 1
+            rel = f"family/{slug(family)}-{n}.json"
+        files[rel] = families[family]
+        family_files[family] = rel
+
+    prefix_files = {}
+    for prefix in sorted(prefixes):
+        rel = f"prefix/{slug(prefix)}.json"
+        files[rel] = prefixes[prefix]
+        prefix_files[prefix] = rel
+
+    return files, lang_files, family_files, prefix_files
+
+
+def load_manifest(output):
+    path = Path(output) / "manifest.json"
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _previous_hashes(manifest):
+    """{suhteellinen polku: tiiviste} edellisestä manifestista."""
+    if not manifest or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    hashes = {}
+    for section in ("families", "prefixes"):
+        for entry in manifest.get(section, {}).values():
+            hashes[entry["file"]] = entry["hash"]
+            if "index" in entry:
+                hashes[entry["index"]["file"]] = entry["index"]["hash"]
+    return hashes
+
+
+def _previous_lang_hashes(output, previous):
+    """Kielitiedostojen tiivisteet edellisistä etuliiteindekseistä."""
+    hashes = {}
+    for rel in previous:
+        if rel.endswith(".index.json") and (Path(output) / rel).exists():
+            with open(Path(output) / rel, "r", encoding="utf-8") as f:
+                for entry in json.load(f).values():
+                    hashes[entry["file"]] = entry["hash"]
+    return hashes
+
+
+def export_static(unified_path=UNIFIED, output=OUTPUT, workers=8):
+    """
+    Kirjoittaa staattiset JSON-tiedostot CDN-jakelua varten.
+
+    manifest.json on pieni: siinä on vain perhe- ja etuliiteshardit
+    tiivisteineen. Kielikohtaisten tiedostojen tiivisteet ovat
+    etuliitteen indeksissä prefix/{xx}.index.json, joten asiakas hakee
+    manifest → indeksi → lang/fin.json?v=<hash>. Vain tiedostot, joiden
+    tiiviste muuttui, kirjoitetaan uudelleen; poistuneet poistetaan.
+    """
+    output = Path(output)
+
+    files, lang_files, family_files, prefix_files = plan_files(iter_unified(unified_path))
+    previous = _previous_hashes(load_manifest(output))
+    previous.update(_previous_lang_hashes(output, previous))
+
+    hashes = {}
+    todo = []
+
+    def add(rel, obj):
+        data = compact_json_bytes(obj)
+        digest = content_hash(data)[:HASH_LEN]
+        hashes[rel] = digest
+        if not (previous.get(rel) == digest and (output / rel).exists()):
+            todo.append((rel, data))
+
+    for rel, obj in files.items():
+        add(rel, obj)
+
+    # Etuliiteindeksit: {id: {"file", "hash"}} kielitiedostoille
+    index_files = {}
+    by_prefix = defaultdict(dict)
+    for lang_id, rel in lang_files.items():
+        by_prefix[prefix_of(lang_id)][lang_id] = {"file": rel, "hash": hashes[rel]}
+    for prefix, rel in prefix_files.items():
+        index_rel = rel[:-len(".json")] + ".index.json"
+        add(index_rel, by_prefix[prefix])
+        index_files[prefix] = index_rel
+
+    def write_file(job):
+        rel, data = job
+        atomic_write_bytes(output / rel, data)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(write_file, todo))
+
+    # Poista tiedostot, joita ei enää ole
+    removed = 0
+    for rel in previous:
+        if rel not in hashes:
+            stale = output / rel
+            if stale.exists():
+                stale.unlink()
+                removed += 1
+
+    def entry(rel, count):
+        return {"file": rel, "hash": hashes[rel], "count": count}
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "prefix_len": PREFIX_LEN,
+        "languages": len(lang_files),
+        "families": {f: entry(rel, len(files[rel])) for f, rel in family_files.items()},
+        "prefixes": {
+            p: {**entry(rel, len(files[rel])),
+                "index": {"file": index_files[p], "hash": hashes[index_files[p]]}}
+            for p, rel in prefix_files.items()
+        },
+    }
+    atomic_write_bytes(output / "manifest.json", compact_json_bytes(manifest))
+
+    print(f"Static export: {len(hashes)} files, {len(todo)} written, {removed} removed")
+    print(f"Manifest written to: {output / 'manifest.json'}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export per-language and sharded static JSON files.")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    export_static(args.input, args.output, args.workers)
+
+
+if __name__ == "__main__":
+    main()
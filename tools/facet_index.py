@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import file_stamp
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+OUTPUT = PROJECT_ROOT / "output" / "unified" / "facet_index.json"
+
+FACET_INDEX_VERSION = 1
+
+
+def _glottolog(info, key):
+    return (info.get("glottolog") or {}).get(key)
+
+
+# Facetti → funktio, joka palauttaa kielen arvot (monta arvoa sallittu)
+FACETS = {
+    "default_script": lambda info: [info.get("default_script")],
+    "written_scripts": lambda info: info.get("written_scripts") or [],
+    "default_region": lambda info: [info.get("default_region")],
+    "family": lambda info: [info.get("family") or _glottolog(info, "family")],
+    "macroarea": lambda info: [_glottolog(info, "macroarea")],
+    "uralicNLP": lambda info: [bool(info.get("uralicNLP"))],
+    "written": lambda info: [bool(info.get("written"))],
+}
+
+
+if hasattr(int, "bit_count"):
+    def popcount(bits):
+        return bits.bit_count()
+else:  # Python < 3.10
+    def popcount(bits):
+        return bin(bits).count("1")
+
+
+def iter_positions(bits):
+    """Bittikartan asetettujen bittien paikat nousevassa järjestyksessä."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FacetIndex:
+    """
+    Käänteisindeksit facettiarvoista bittikarttoihin.
+
+    Jokainen kieli saa tiheän paikan 0..n-1, ja jokainen (facetti, arvo)
+    -pari on Python int -bittikartta. Yhdistelmät lasketaan suoraan
+    bittioperaatioilla: AND (&), OR (|) ja NOT (all_bits & ~b).
+    """
+
+    def __init__(self, ids, facets, source=None):
+        self.ids = list(ids)
+        self.source = source
+        self.positions = {lang_id: i for i, lang_id in enumerate(self.ids)}
+        self.facets = facets
+        self.all_bits = (1 << len(self.ids)) - 1
+
+    # --- Rakentaminen ja tallennus ---
+
+    @classmethod
+    def build(cls, unified, facets=FACETS):
+        """unified on sanakirja tai (id, tietue) -parien virta (iter_unified)."""
+        pairs = unified.items() if isinstance(unified, dict) else unified
+        ids = []
+        index = {name: {} for name in facets}
+
+        for pos, (lang_id, info) in enumerate(pairs):
+            ids.append(lang_id)
+            bit = 1 << pos
+            for name, extract in facets.items():
+                values = index[name]
+                for value in set(extract(info)):
+                    if value is None or value == "":
+                        continue
+                    values[value] = values.get(value, 0) | bit
+
+        return cls(ids, index)
+
+    def save(self, path=OUTPUT, source=None):
+        """source = unified-tiedosto, josta indeksi rakennettiin (koko ja mtime tallennetaan)."""
+        if source is not None:
+            self.source = file_stamp(source)
+        payload = {
+            "version": FACET_INDEX_VERSION,
+            "source": self.source,
+            "ids": self.ids,
+            "facets": {
+                name: [[value, format(bits, "x")] for value, bits in values.items()]
+                for name, values in self.facets.items()
+            },
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path=OUTPUT):
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        if payload.get("version") != FACET_INDEX_VERSION:
+            raise ValueError(f"Unsupported facet index version: {payload.get('version')}")
+
+        facets = {
+            name: {value: int(bits, 16) for value, bits in pairs}
+            for name, pairs in payload["facets"].items()
+        }
+        return cls(payload["ids"], facets, payload.get("source"))
+
+    def matches(self, source):
+        """Onko indeksi rakennettu source-tiedoston nykyisestä versiosta."""
+        return self.source is not None and self.source == file_stamp(source)
+
+    # --- Bittikarttaoperaatiot ---
+
+    def bitmap(self, facet, value):
+        return self.facets[facet].get(value, 0)
+
+    def any_of(self, facet, values):
+        """OR saman facetin arvojen yli."""
+        bits = 0
+        for value in values:
+            bits |= self.bitmap(facet, value)
+        return bits
+
+    def negate(self, bits):
+        return self.all_bits & ~bits
+
+    def select(self, where=None, exclude=None):
+        """
+        where:   {facetti: arvo tai [arvot]} — facettien välillä AND, arvojen välillä OR
+        exclude: {facetti: arvo tai [arvot]} — poistetaan (AND NOT)
+        """
+        bits = self.all_bits
+
+        for facet, value in (where or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            bits &= self.any_of(facet, values)
+            if not bits:
+                return 0
+
+        for facet, value in (exclude or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            bits &= self.negate(self.any_of(facet, values))
+
+        return bits
+
+    def count(self, bits):
+        return popcount(bits)
+
+    def ids_of(self, bits):
+        ids = self.ids
+        return [ids[pos] for pos in iter_positions(bits)]
+
+    def facet_counts(self, bits=None, facets=None):
+        """
+        Jokaisen facettiarvon osumamäärä annetussa valinnassa kerralla:
+        {facetti: {arvo: määrä}}, nollat pois, suurin ensin.
+        """
+        if bits is None:
+            bits = self.all_bits
+
+        result = {}
+        for name in facets or self.facets:
+            counts = []
+            for value, value_bits in self.facets[name].items():
+                n = popcount(bits & value_bits)
+                if n:
+                    counts.append((value, n))
+            counts.sort(key=lambda item: (-item[1], str(item[0])))
+            result[name] = dict(counts)
+        return result
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def _parse_filters(pairs):
+    filters = {}
+    for pair in pairs or []:
+        facet, _, value = pair.partition("=")
+        if facet in ("uralicNLP", "written"):
+            value = value.lower() in ("1", "true", "yes")
+        filters.setdefault(facet, []).append(value)
+    return filters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the facet bitmap index.")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--index", type=Path, default=OUTPUT)
+    parser.add_argument("--build", action="store_true", help="Rebuild the index from unified data")
+    parser.add_argument("--where", action="append", metavar="FACET=VALUE")
+    parser.add_argument("--exclude", action="append", metavar="FACET=VALUE")
+    parser.add_argument("--ids", action="store_true", help="Print matching language IDs")
+    args = parser.parse_args(argv)
+
+    index = None
+    if not args.build and args.index.exists():
+        index = FacetIndex.load(args.index)
+        if not index.matches(args.input):
+            print(f"Facet index is stale for {args.input}, rebuilding")
+            index = None
+
+    if index is None:
+        index = FacetIndex.build(iter_unified(args.input))
+        index.save(args.index, source=args.input)
+        print(f"Facet index: {len(index.ids)} languages, saved to {args.index}")
+        if not (args.where or args.exclude):
+            return
+
+    bits = index.select(_parse_filters(args.where), _parse_filters(args.exclude))
+    print(f"Matches: {index.count(bits)}")
+
+    if args.ids:
+        print(" ".join(index.ids_of(bits)))
+        return
+
+    for facet, counts in index.facet_counts(bits).items():
+        if not counts:
+            continue
+        top = ", ".join(f"{value}={n}" for value, n in list(counts.items())[:10])
+        print(f"  {facet}: {top}")
+
+
+if __name__ == "__main__":
+    main()
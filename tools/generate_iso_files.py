@@ -30,20 +30,28 @@
 #
 
 import sys
-import urllib.request
 from pathlib import Path
 from parse_iso_files import parse_all_iso_files
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
-DATA = Path("data")
+from loaders.fetch_sources import CLDR_SOURCE, ISO_SOURCES, fetch_all
+
+
+DATA = PROJECT_ROOT / "data"
 DATA.mkdir(exist_ok=True)
 
-URLS = {
-    "iso_639_3": "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3.tab",
-    "iso_639_3_names": "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3_Name_Index.tab",
-    "iso_639_3_macrolanguages": "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3-macrolanguages.tab",
-    "iso_639_5": "https://id.loc.gov/vocabulary/iso639-5.skos.rdf",
-}
+# generate_iso_modules() kirjoittaa nämä moduulit
+MODULES = [
+    "iso_639_1",
+    "iso_639_2",
+    "iso_639_3",
+    "iso_639_3_names",
+    "iso_639_3_macrolanguages",
+    "iso_639_5",
+    "iso_639_5_hierarchy",
+]
 
 
 def fail(msg):
@@ -51,47 +59,38 @@ def fail(msg):
     sys.exit(1)
 
 
-def safe_download(url_key):
-    url = URLS[url_key]
-    out = DATA / f"{url_key}.tab" if url_key != "iso_639_5" else DATA / f"{url_key}.rdf"
-
-    print(f"Ladataan {url_key}: {url}")
+def download_sources():
+    """
+    Lataa ISO-lähteet ja CLDR:n rinnakkain ehdollisilla pyynnöillä.
+    Palauttaa True, jos jokin ISO-lähde muuttui.
+    """
+    results = fetch_all(ISO_SOURCES + [CLDR_SOURCE])
 
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0 Safari/537.36"
-            )
-        }
-    )
-
-    try:
-        with urllib.request.urlopen(req) as response:
-            if response.status != 200:
-                fail(f"HTTP {response.status} ladattaessa {url_key}")
-            content = response.read().decode("utf-8")
-    except Exception as e:
-        fail(f"Virhe ladattaessa {url_key}: {e}")
+    for source in ISO_SOURCES:
+        result = results[source.key]
+        if not result.ok:
+            fail(f"Virhe ladattaessa {result.key}: {result.error}")
 
-    try:
-        out.write_text(content, encoding="utf-8")
-    except Exception as e:
-        fail(f"Virhe tallennettaessa {out}: {e}")
+    # CLDR ei ole ISO-vaiheen edellytys: virhe ei kaada ajoa, vaan
+    # käytetään aiemmin ladattua tiedostoa, jos sellainen on
+    cldr = results[CLDR_SOURCE.key]
+    if not cldr.ok:
+        kept = "käytetään olemassa olevaa tiedostoa" if CLDR_SOURCE.dest.exists() else "tiedostoa ei ole"
+        print(f"VAROITUS: CLDR-lataus epäonnistui ({cldr.error}); {kept}.")
 
-    print(f"Tallennettu: {out}")
-    return out
+    return any(results[source.key].changed for source in ISO_SOURCES)
 
 
 def generate_iso_modules():
     print("\n=== Ladataan ISO-lähteet ===")
 
-    tab3 = safe_download("iso_639_3")
-    tab_names = safe_download("iso_639_3_names")
-    tab_macro = safe_download("iso_639_3_macrolanguages")
-    rdf5 = safe_download("iso_639_5")
+    changed = download_sources()
+
+    if not changed and all((DATA / f"{name}.py").exists() for name in MODULES):
+        print("\nISO-lähteet eivät muuttuneet, moduulit ovat ajan tasalla.")
+        return
+
+    tab3, tab_names, tab_macro, rdf5 = (source.dest for source in ISO_SOURCES)
 
     print("\n=== Parsitaan ISO-tiedostot (parse_iso_files.py) ===")
 
@@ -124,6 +123,9 @@ def generate_iso_modules():
         (DATA / "iso_639_5.py").write_text(
             f"iso_639_5 = {data['iso639_5']}\n", encoding="utf-8"
         )
+        (DATA / "iso_639_5_hierarchy.py").write_text(
+            f"iso_639_5_hierarchy = {data['iso639_5_hierarchy']}\n", encoding="utf-8"
+        )
 
     except Exception as e:
         fail(f"Virhe kirjoitettaessa Python-moduuleja: {e}")
@@ -36,6 +36,10 @@ from pathlib import Path
 import html
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 TOOLS = PROJECT_ROOT / "tools"
 OUTPUT_ROOT = PROJECT_ROOT / "output" / "validation"
 OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
@@ -87,10 +91,8 @@ def generate_report():
     with open(VALIDATION_ERRORS_JSON, "w", encoding="utf-8") as f:
         json.dump(errors_json, f, ensure_ascii=False, indent=2)
 
-    # --- Lataa unified ---
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        unified = json.load(f)
-    lang_count = len(unified)
+    # --- Laske kielet virtana ---
+    lang_count = sum(1 for _ in iter_unified(UNIFIED))
 
     # --- Markdown-raportti ---
     md = f"""# Unified Pipeline Report
@@ -155,37 +155,114 @@ def parse_iso639_3_macrolanguages(path):
     return macros
 
 
-def parse_iso639_5_rdf(path):
-    """
-    Parsii ISO-639-5 SKOS RDF -tiedoston:
-    http://id.loc.gov/vocabulary/iso639-5.skos.rdf
-    """
-    iso5 = {}
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+SKOS_NS = "http://www.w3.org/2004/02/skos/core#"
+ISO639_5_BASE = "http://id.loc.gov/vocabulary/iso639-5/"
 
-    path = Path(path)
+_RDF_DESCRIPTION = f"{{{RDF_NS}}}Description"
+_RDF_ABOUT = f"{{{RDF_NS}}}about"
+_RDF_RESOURCE = f"{{{RDF_NS}}}resource"
+_SKOS_PREFLABEL = f"{{{SKOS_NS}}}prefLabel"
+_SKOS_NARROWER = f"{{{SKOS_NS}}}narrower"
+_SKOS_BROADER = f"{{{SKOS_NS}}}broader"
 
-    tree = ET.parse(path)
-    root = tree.getroot()
 
-    ns = {
-        "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-        "skos": "http://www.w3.org/2004/02/skos/core#"
-    }
+def _iso639_5_code(uri):
+    if not uri or not uri.startswith(ISO639_5_BASE):
+        return None
+    code = uri[len(ISO639_5_BASE):].strip("/")
+    return code or None
+
 
-    for concept in root.findall("rdf:Description", ns):
-        about = concept.get("{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about")
-        if not about or "iso639-5" not in about:
+def iter_iso639_5_concepts(path):
+    """
+    Käy ISO-639-5 SKOS RDF -tiedoston läpi iterparse-virtana.
+    Tuottaa jokaisesta käsitteestä (code, label, narrower, broader) heti
+    kun sen elementti sulkeutuu, ja vapauttaa elementin. Muistinkäyttö ei
+    riipu tiedoston koosta.
+    """
+    depth = 0
+    root = None
+
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
             continue
 
-        if not about.startswith("http://id.loc.gov/vocabulary/iso639-5/"):
+        depth -= 1
+
+        # Vain rdf:RDF:n suorat lapset ovat käsitteitä
+        if depth != 1 or elem.tag != _RDF_DESCRIPTION:
             continue
 
-        code = about.split("/")[-1]
-        label = concept.find("skos:prefLabel", ns)
+        code = _iso639_5_code(elem.get(_RDF_ABOUT))
+        if code:
+            label = None
+            narrower = []
+            broader = []
+
+            for child in elem:
+                if child.tag == _SKOS_PREFLABEL:
+                    if label is None and child.text:
+                        label = child.text
+                elif child.tag == _SKOS_NARROWER:
+                    other = _iso639_5_code(child.get(_RDF_RESOURCE))
+                    if other:
+                        narrower.append(other)
+                elif child.tag == _SKOS_BROADER:
+                    other = _iso639_5_code(child.get(_RDF_RESOURCE))
+                    if other:
+                        broader.append(other)
 
-        if label is not None and label.text:
-            iso5[code] = label.text
+            yield code, label, narrower, broader
 
+        elem.clear()
+        root.clear()
+
+
+def parse_iso639_5_rdf_stream(path):
+    """
+    Parsii ISO-639-5 SKOS RDF -tiedoston yhdellä virtaavalla kierroksella.
+    Palauttaa (iso5, hierarchy):
+    - iso5: {code: label}
+    - hierarchy: {"broader": {code: [vanhemmat]}, "narrower": {code: [lapset]}}
+      skos:narrower- ja skos:broader-suhteet yhdistetään molempiin suuntiin.
+    """
+    iso5 = {}
+    broader = {}
+    narrower = {}
+
+    def link(parent, child):
+        children = narrower.setdefault(parent, [])
+        if child not in children:
+            children.append(child)
+        parents = broader.setdefault(child, [])
+        if parent not in parents:
+            parents.append(parent)
+
+    for code, label, narrower_codes, broader_codes in iter_iso639_5_concepts(path):
+        if label:
+            iso5[code] = label
+        for child in narrower_codes:
+            link(code, child)
+        for parent in broader_codes:
+            link(parent, code)
+
+    hierarchy = {
+        "broader": {k: sorted(v) for k, v in sorted(broader.items())},
+        "narrower": {k: sorted(v) for k, v in sorted(narrower.items())},
+    }
+    return iso5, hierarchy
+
+
+def parse_iso639_5_rdf(path):
+    """
+    Parsii ISO-639-5 SKOS RDF -tiedoston:
+    http://id.loc.gov/vocabulary/iso639-5.skos.rdf
+    """
+    iso5, _ = parse_iso639_5_rdf_stream(path)
     return iso5
 
 
@@ -198,7 +275,7 @@ def parse_all_iso_files(
     iso1, iso2, iso3 = parse_iso639_3(iso639_3_path)
     names = parse_iso639_3_names(name_index_path)
     macros = parse_iso639_3_macrolanguages(macrolanguages_path)
-    iso5 = parse_iso639_5_rdf(iso639_5_path)
+    iso5, iso5_hierarchy = parse_iso639_5_rdf_stream(iso639_5_path)
 
     return {
         "iso639_1": iso1,
@@ -207,6 +284,7 @@ def parse_all_iso_files(
         "iso639_3_names": names,
         "iso639_3_macrolanguages": macros,
         "iso639_5": iso5,
+        "iso639_5_hierarchy": iso5_hierarchy,
     }
 
 
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from facet_index import FacetIndex, OUTPUT as FACET_INDEX
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import StaleIndexError, UnifiedIndex, iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+
+# Lyhyet kenttänimet → polku unified-tietueessa
+FIELD_ALIASES = {
+    "lat": ("glottolog", "latitude"),
+    "latitude": ("glottolog", "latitude"),
+    "lon": ("glottolog", "longitude"),
+    "longitude": ("glottolog", "longitude"),
+    "macroarea": ("glottolog", "macroarea"),
+    "lineage": ("glottolog", "lineage"),
+}
+
+# Kenttä → facet_index-facetti, jonka bittikartta on kentän arvon ylijoukko
+INDEXED_FIELDS = {
+    ("default_script",): "default_script",
+    ("default_region",): "default_region",
+    ("family",): "family",
+    ("glottolog", "macroarea"): "macroarea",
+    ("uralicNLP",): "uralicNLP",
+    ("written",): "written",
+}
+INDEXED_LISTS = {
+    ("written_scripts",): "written_scripts",
+}
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+# ---------------------------------------------------------
+# Tokenointi
+# ---------------------------------------------------------
+
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|<=|>=|=|<|>|\(|\)|\[|\]|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    )""", re.VERBOSE)
+
+KEYWORDS = {"and", "or", "not", "in", "true", "false", "null"}
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise QuerySyntaxError(f"Unexpected input at position {pos}: {text[pos:pos + 10]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "string":
+            value = json.loads('"' + value[1:-1].replace('\\\'', "'").replace('"', '\\"') + '"') \
+                if value[0] == "'" else json.loads(value)
+        elif kind == "number":
+            value = float(value) if "." in value else int(value)
+        elif kind == "name" and value.lower() in KEYWORDS:
+            kind, value = "kw", value.lower()
+        tokens.append((kind, value))
+    tokens.append(("end", None))
+    return tokens
+
+
+# ---------------------------------------------------------
+# Jäsennys → AST (tuplet)
+#   ("or", [..]) ("and", [..]) ("not", x) ("cmp", op, a, b)
+#   ("in", item, container) ("field", path) ("const", value) ("list", [..])
+# ---------------------------------------------------------
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i]
+
+    def take(self):
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def accept(self, kind, value=None):
+        tok = self.peek()
+        if tok[0] == kind and (value is None or tok[1] == value):
+            self.i += 1
+            return True
+        return False
+
+    def expect(self, kind, value=None):
+        if not self.accept(kind, value):
+            raise QuerySyntaxError(f"Expected {value or kind}, got {self.peek()[1]!r}")
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek()[0] != "end":
+            raise QuerySyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        parts = [self.parse_and()]
+        while self.accept("kw", "or"):
+            parts.append(self.parse_and())
+        return parts[0] if len(parts) == 1 else ("or", parts)
+
+    def parse_and(self):
+        parts = [self.parse_not()]
+        while self.accept("kw", "and"):
+            parts.append(self.parse_not())
+        return parts[0] if len(parts) == 1 else ("and", parts)
+
+    def parse_not(self):
+        if self.accept("kw", "not"):
+            return ("not", self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left = self.parse_operand()
+        tok = self.peek()
+
+        if tok[0] == "op" and tok[1] in ("=", "==", "!=", "<", "<=", ">", ">="):
+            self.take()
+            op = "==" if tok[1] == "=" else tok[1]
+            return ("cmp", op, left, self.parse_operand())
+
+        if self.accept("kw", "in"):
+            return ("in", left, self.parse_operand())
+
+        if tok == ("kw", "not") and self.tokens[self.i + 1] == ("kw", "in"):
+            self.i += 2
+            return ("not", ("in", left, self.parse_operand()))
+
+        return left
+
+    def parse_operand(self):
+        kind, value = self.take()
+
+        if kind in ("number", "string"):
+            return ("const", value)
+        if kind == "kw" and value in ("true", "false", "null"):
+            return ("const", {"true": True, "false": False, "null": None}[value])
+        if kind == "name":
+            return ("field", resolve_field(value))
+        if (kind, value) == ("op", "("):
+            node = self.parse_or()
+            self.expect("op", ")")
+            return node
+        if (kind, value) == ("op", "["):
+            items = []
+            if not self.accept("op", "]"):
+                while True:
+                    item = self.parse_operand()
+                    if item[0] != "const":
+                        raise QuerySyntaxError("List literals may only contain constants")
+                    items.append(item[1])
+                    if self.accept("op", "]"):
+                        break
+                    self.expect("op", ",")
+            return ("const", items)
+
+        raise QuerySyntaxError(f"Unexpected token {value!r}")
+
+
+def resolve_field(name):
+    if name in FIELD_ALIASES:
+        return FIELD_ALIASES[name]
+    return tuple(name.split("."))
+
+
+def parse(text):
+    return _Parser(tokenize(text)).parse()
+
+
+# ---------------------------------------------------------
+# Kääntäminen Python-bytecodeksi
+# ---------------------------------------------------------
+
+def _lt(a, b):
+    try:
+        return a is not None and b is not None and a < b
+    except TypeError:
+        return False
+
+
+def _le(a, b):
+    try:
+        return a is not None and b is not None and a <= b
+    except TypeError:
+        return False
+
+
+def _gt(a, b):
+    try:
+        return a is not None and b is not None and a > b
+    except TypeError:
+        return False
+
+
+def _ge(a, b):
+    try:
+        return a is not None and b is not None and a >= b
+    except TypeError:
+        return False
+
+
+def _contains(container, item):
+    if container is None:
+        return False
+    try:
+        return item in container
+    except TypeError:
+        return False
+
+
+_ORDERING = {"<": "_lt", "<=": "_le", ">": "_gt", ">=": "_ge"}
+
+
+class _Compiler:
+    def __init__(self):
+        self.consts = []
+
+    def const(self, value):
+        self.consts.append(value)
+        return f"_c[{len(self.consts) - 1}]"
+
+    def field(self, path):
+        expr = f"r.get({path[0]!r})"
+        for key in path[1:]:
+            expr = f"({expr} or _empty).get({key!r})"
+        return expr
+
+    def emit(self, node):
+        kind = node[0]
+        if kind == "or":
+            return "(" + " or ".join(self.emit(p) for p in node[1]) + ")"
+        if kind == "and":
+            return "(" + " and ".join(self.emit(p) for p in node[1]) + ")"
+        if kind == "not":
+            return f"(not {self.emit(node[1])})"
+        if kind == "cmp":
+            _, op, a, b = node
+            if op in _ORDERING:
+                return f"{_ORDERING[op]}({self.emit(a)}, {self.emit(b)})"
+            return f"({self.emit(a)} {op} {self.emit(b)})"
+        if kind == "in":
+            return f"_contains({self.emit(node[2])}, {self.emit(node[1])})"
+        if kind == "field":
+            return self.field(node[1])
+        if kind == "const":
+            value = node[1]
+            return self.const(tuple(value) if isinstance(value, list) else value)
+        raise ValueError(f"Unknown node {kind}")
+
+
+def compile_predicate(node):
+    """AST → Python-funktio r → bool (käännetään kerran compile():lla)."""
+    compiler = _Compiler()
+    body = compiler.emit(node)
+    source = f"def _predicate(r):\n    return bool({body})\n"
+    namespace = {
+        "_c": compiler.consts,
+        "_empty": {},
+        "_lt": _lt, "_le": _le, "_gt": _gt, "_ge": _ge,
+        "_contains": _contains,
+    }
+    exec(compile(source, "<glfm-query>", "exec"), namespace)
+    predicate = namespace["_predicate"]
+    predicate.source = source
+    return predicate
+
+
+# ---------------------------------------------------------
+# Suunnittelija: facet-indeksi ensin, sitten käännetty predikaatti
+# ---------------------------------------------------------
+
+def _indexable(value):
+    """
+    Onko vakio haettavissa facet-indeksistä. Indeksiin ei tallenneta
+    None- eikä ""-arvoja, eikä lista kelpaa avaimeksi, joten niitä
+    koskevat vertailut arvioidaan täydellä läpikäynnillä.
+    """
+    return value is not None and value != "" and not isinstance(value, (list, tuple, dict))
+
+
+def _index_bits(node, index):
+    """
+    Palauttaa bittikartan, joka on solmun osumien ylijoukko, tai None jos
+    solmua ei voi arvioida indeksistä. Negaatioita ei käytetä, koska
+    ylijoukon komplementti ei ole ylijoukko.
+    """
+    kind = node[0]
+
+    if kind == "and":
+        bits = None
+        for part in node[1]:
+            part_bits = _index_bits(part, index)
+            if part_bits is not None:
+                bits = part_bits if bits is None else bits & part_bits
+        return bits
+
+    if kind == "or":
+        bits = 0
+        for part in node[1]:
+            part_bits = _index_bits(part, index)
+            if part_bits is None:
+                return None
+            bits |= part_bits
+        return bits
+
+    if kind == "field" and node[1] in INDEXED_FIELDS:
+        facet = INDEXED_FIELDS[node[1]]
+        if facet in ("uralicNLP", "written"):
+            return index.bitmap(facet, True)
+        return None
+
+    if kind == "cmp" and node[1] == "==":
+        a, b = node[2], node[3]
+        if b[0] == "field":
+            a, b = b, a
+        if a[0] == "field" and b[0] == "const" and a[1] in INDEXED_FIELDS and _indexable(b[1]):
+            return index.bitmap(INDEXED_FIELDS[a[1]], b[1])
+        return None
+
+    if kind == "in":
+        item, container = node[1], node[2]
+        if container[0] == "field" and item[0] == "const" and container[1] in INDEXED_LISTS \
+                and _indexable(item[1]):
+            return index.bitmap(INDEXED_LISTS[container[1]], item[1])
+        if item[0] == "field" and container[0] == "const" and item[1] in INDEXED_FIELDS \
+                and isinstance(container[1], (list, tuple)) and all(_indexable(v) for v in container[1]):
+            return index.any_of(INDEXED_FIELDS[item[1]], container[1])
+        return None
+
+    return None
+
+
+class Query:
+    """Kerran jäsennetty ja käännetty kysely."""
+
+    def __init__(self, text):
+        self.text = text
+        self.ast = parse(text)
+        self.predicate = compile_predicate(self.ast)
+
+    def plan(self, index=None):
+        if index is None:
+            return None
+        return _index_bits(self.ast, index)
+
+    def explain(self, index=None):
+        bits = self.plan(index)
+        if bits is None:
+            return "full scan\n" + self.predicate.source
+        return f"facet index → {index.count(bits)} candidates, then predicate\n" + self.predicate.source
+
+    def run(self, unified, index=None):
+        """
+        Palauttaa (lang_id, record) -parit osumille unified-järjestyksessä.
+        unified on sanakirja, UnifiedIndex tai (id, tietue) -parien virta
+        (iter_unified); virrasta indeksin ehdokkaat poimitaan läpiluvulla.
+        """
+        predicate = self.predicate
+        bits = self.plan(index)
+
+        if bits is None or not hasattr(unified, "get"):
+            wanted = None if bits is None else set(index.ids_of(bits))
+            if isinstance(unified, dict):
+                pairs = unified.items()
+            elif isinstance(unified, UnifiedIndex):
+                # Täysi läpikäynti: tiedosto luetaan virtana järjestyksessä
+                pairs = iter_unified(unified.path, unified.format)
+            else:
+                pairs = unified
+            for lang_id, record in pairs:
+                if (wanted is None or lang_id in wanted) and predicate(record):
+                    yield lang_id, record
+            return
+
+        for lang_id in index.ids_of(bits):
+            record = unified.get(lang_id)
+            if record is not None and predicate(record):
+                yield lang_id, record
+
+
+def load_matching_index(unified, path=FACET_INDEX, source=None):
+    """
+    Ladataan facet-indeksi vain, jos se vastaa annettua dataa: source
+    (unified-tiedosto) ei saa olla muuttunut indeksin rakentamisen jälkeen,
+    ja ID-joukkojen on oltava samat. unified=None ohittaa ID-vertailun
+    (virtaluvussa pelkkä source-tarkistus).
+    """
+    if not Path(path).exists():
+        return None
+    index = FacetIndex.load(path)
+    if source is not None and not index.matches(source):
+        return None
+    if unified is not None and (
+        len(index.ids) != len(unified) or any(lang_id not in unified for lang_id in index.ids)
+    ):
+        return None
+    return index
+
+
+def open_offsets(path):
+    """UnifiedIndex hajasaantiin tai None, jos sivutiedosto puuttuu tai on vanhentunut."""
+    try:
+        return UnifiedIndex(path)
+    except (FileNotFoundError, StaleIndexError):
+        return None
+
+
+# ---------------------------------------------------------
+# CLI: osumat JSONL-virtana stdoutiin
+# ---------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Query unified data, e.g. \'family = "Uralic" and written and "Cyrl" in written_scripts and lat > 60\''
+    )
+    parser.add_argument("query")
+    parser.add_argument("--input", type=Path, default=UNIFIED)
+    parser.add_argument("--index", type=Path, default=FACET_INDEX)
+    parser.add_argument("--no-index", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--count", action="store_true", help="Print only the number of matches")
+    parser.add_argument("--explain", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        query = Query(args.query)
+    except QuerySyntaxError as e:
+        print(f"Query error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    # Indeksin kanssa tietueet haetaan offset-sivutiedoston kautta; muuten
+    # (tai jos sivutiedostoa ei ole) unified luetaan virtana
+    records = None if args.no_index else open_offsets(args.input)
+    index = None if args.no_index else load_matching_index(records, args.index, source=args.input)
+
+    if args.explain:
+        print(query.explain(index), file=sys.stderr)
+
+    unified = records if records is not None else iter_unified(args.input)
+
+    matches = 0
+    out = sys.stdout
+    try:
+        for _, record in query.run(unified, index):
+            matches += 1
+            if not args.count:
+                out.write(json.dumps(record, ensure_ascii=False))
+                out.write("\n")
+            if args.limit and matches >= args.limit:
+                break
+    finally:
+        if records is not None:
+            records.close()
+
+    if args.count:
+        print(matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from diff_unified import record_hash
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.file_utils import atomic_write_bytes, compact_json_bytes
+from loaders.load_unified import iter_unified
+
+UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
+STORE = PROJECT_ROOT / "output" / "history"
+
+STORE_VERSION = 1
+# Joka N:s versio tallennetaan täydellisenä manifestina, muut deltoina
+CHECKPOINT_INTERVAL = 16
+COMPRESS_LEVEL = 6
+
+
+class HistoryStore:
+    """
+    Sisältöosoitteellinen versiovarasto unified-buildeille.
+
+    Rakenne hakemistossa:
+      packs/000001.pack    version uudet tietueet peräkkäin zlib-pakattuina
+                           (kanoninen JSON); sama tietue tallennetaan vain kerran
+      packs/000001.idx     {record_hash: [alku, pituus]} pakkatiedostoon
+      builds/000001.json   version manifesti: joko checkpoint
+                           {"ids": {lang_id: tiiviste}} tai delta edelliseen
+                           {"set": {lang_id: tiiviste}, "remove": [lang_id]}
+      history.json         versioluettelo
+
+    Levynkäyttö kasvaa muutosten koon mukaan: uusi versio lisää vain
+    muuttuneet tietueet ja deltan. Haut ("kieli X versiossa N", "kentän F
+    muutokset välillä N..M") lukevat manifesteja ja vain tarvittavat
+    objektit, eivät koko snapshotteja.
+
+        store = HistoryStore()
+        n = store.commit(iter_unified(path))
+        store.get("fin", as_of=n)
+    """
+
+    def __init__(self, root=STORE):
+        self.root = Path(root)
+        self._manifests = {}
+        self._locations = None
+        meta_path = self.root / "history.json"
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("version") != STORE_VERSION:
+                raise ValueError(f"Unsupported history store version: {self.meta.get('version')}")
+        else:
+            self.meta = {"version": STORE_VERSION, "builds": []}
+
+    # --- Objektit ja manifestit ---
+
+    def _pack_path(self, n, suffix):
+        return self.root / "packs" / f"{n:06d}.{suffix}"
+
+    def _load_locations(self):
+        """{tiiviste: (pakka, alku, pituus)} kaikista pakkaindekseistä."""
+        if self._locations is None:
+            self._locations = {}
+            for build in self.meta["builds"]:
+                if not build["objects"]:
+                    continue
+                with open(self._pack_path(build["n"], "idx"), "r", encoding="utf-8") as f:
+                    for digest, (start, length) in json.load(f).items():
+                        self._locations[digest] = (build["n"], start, length)
+        return self._locations
+
+    def _write_pack(self, n, objects):
+        """Kirjoittaa version uudet objektit yhteen pakkaan ja sen indeksin."""
+        chunks = []
+        index = {}
+        pos = 0
+        for digest, record in objects.items():
+            data = zlib.compress(compact_json_bytes(record), COMPRESS_LEVEL)
+            index[digest] = [pos, len(data)]
+            chunks.append(data)
+            pos += len(data)
+        atomic_write_bytes(self._pack_path(n, "pack"), b"".join(chunks))
+        atomic_write_bytes(self._pack_path(n, "idx"), compact_json_bytes(index))
+
+        locations = self._load_locations()
+        for digest, (start, length) in index.items():
+            locations[digest] = (n, start, length)
+
+    def _get_object(self, digest):
+        n, start, length = self._load_locations()[digest]
+        with open(self._pack_path(n, "pack"), "rb") as f:
+            f.seek(start)
+            return json.loads(zlib.decompress(f.read(length)).decode("utf-8"))
+
+    def _manifest_path(self, n):
+        return self.root / "builds" / f"{n:06d}.json"
+
+    def _manifest(self, n):
+        manifest = self._manifests.get(n)
+        if manifest is None:
+            with open(self._manifest_path(n), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self._manifests[n] = manifest
+        return manifest
+
+    # --- Versiot ---
+
+    @property
+    def latest(self):
+        builds = self.meta["builds"]
+        return builds[-1]["n"] if builds else 0
+
+    def builds(self):
+        return list(self.meta["builds"])
+
+    def _check_build(self, n):
+        if not 1 <= n <= self.latest:
+            raise KeyError(f"No such build: {n}")
+
+    def ids_at(self, n):
+        """{lang_id: tiiviste} versiossa n (lähimmästä checkpointista deltoja soveltaen)."""
+        self._check_build(n)
+        chain = []
+        k = n
+        while True:
+            manifest = self._manifest(k)
+            if "ids" in manifest:
+                break
+            chain.append(manifest)
+            k -= 1
+
+        ids = dict(manifest["ids"])
+        for delta in reversed(chain):
+            for lang_id in delta["remove"]:
+                ids.pop(lang_id, None)
+            ids.update(delta["set"])
+        return ids
+
+    def commit(self, records, label=None):
+        """
+        Tallentaa uuden version (lang_id, tietue) -pareista tai dictistä.
+        Palauttaa versionumeron.
+        """
+        items = records.items() if isinstance(records, dict) else records
+        previous = self.ids_at(self.latest) if self.latest else {}
+
+        known = self._load_locations()
+        n = self.latest + 1
+
+        ids = {}
+        objects = {}
+        for lang_id, record in items:
+            digest = record_hash(record)
+            ids[lang_id] = digest
+            if digest not in known:
+                objects[digest] = record
+
+        if objects:
+            self._write_pack(n, objects)
+
+        checkpoint = n == 1 or (n - 1) % CHECKPOINT_INTERVAL == 0
+        if checkpoint:
+            manifest = {"n": n, "ids": ids}
+        else:
+            manifest = {
+                "n": n,
+                "set": {i: h for i, h in ids.items() if previous.get(i) != h},
+                "remove": [i for i in previous if i not in ids],
+            }
+        atomic_write_bytes(self._manifest_path(n), compact_json_bytes(manifest))
+        self._manifests[n] = manifest
+
+        self.meta["builds"].append({
+            "n": n,
+            "label": label,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "count": len(ids),
+            "changed": sum(1 for i, h in ids.items() if previous.get(i) != h),
+            "removed": sum(1 for i in previous if i not in ids),
+            "objects": len(objects),
+            "checkpoint": checkpoint,
+        })
+        atomic_write_bytes(self.root / "history.json", compact_json_bytes(self.meta))
+        return n
+
+    # --- Haut ---
+
+    def hash_of(self, lang_id, as_of=None):
+        """
+        Kielen tiiviste versiossa as_of (oletus: uusin) tai None.
+        Kulkee deltoja taaksepäin, kunnes kieli mainitaan tai vastaan
+        tulee checkpoint; koko tilaa ei muodosteta.
+        """
+        n = self.latest if as_of is None else as_of
+        self._check_build(n)
+        while True:
+            manifest = self._manifest(n)
+            if "ids" in manifest:
+                return manifest["ids"].get(lang_id)
+            if lang_id in manifest["set"]:
+                return manifest["set"][lang_id]
+            if lang_id in manifest["remove"]:
+                return None
+            n -= 1
+
+    def get(self, lang_id, as_of=None, default=None):
+        """Kielen tietue versiossa as_of (oletus: uusin)."""
+        digest = self.hash_of(lang_id, as_of)
+        return default if digest is None else self._get_object(digest)
+
+    def field_changes(self, field, start, end):
+        """
+        Kentän muutokset versioiden start ja end välillä (start < n <= end).
+        Tuottaa (n, lang_id, vanha arvo, uusi arvo); poistettu/puuttuva
+        kenttä on None. Vain versioiden välillä muuttuneet tietueet luetaan.
+        """
+        self._check_build(start)
+        self._check_build(end)
+        state = self.ids_at(start)
+
+        for n in range(start + 1, end + 1):
+            manifest = self._manifest(n)
+            if "ids" in manifest:
+                ids = manifest["ids"]
+                changed = {i: h for i, h in ids.items() if state.get(i) != h}
+                removed = [i for i in state if i not in ids]
+            else:
+                changed = manifest["set"]
+                removed = manifest["remove"]
+
+            for lang_id in sorted(set(changed) | set(removed)):
+                old_digest = state.get(lang_id)
+                new_digest = changed.get(lang_id)
+                old = self._get_object(old_digest).get(field) if old_digest else None
+                new = self._get_object(new_digest).get(field) if new_digest else None
+                if compact_json_bytes(old) != compact_json_bytes(new):
+                    yield n, lang_id, old, new
+
+            for lang_id in removed:
+                state.pop(lang_id, None)
+            state.update(changed)
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content-addressed history of unified builds.")
+    parser.add_argument("--store", type=Path, default=STORE)
+    parser.add_argument("--add", type=Path, nargs="?", const=UNIFIED, metavar="PATH",
+                        help="Store a unified build as a new version")
+    parser.add_argument("--label")
+    parser.add_argument("--show", metavar="LANG_ID", help="Print a language record")
+    parser.add_argument("--as-of", type=int, metavar="N")
+    parser.add_argument("--changes", metavar="FIELD", help="List changes to a field")
+    parser.add_argument("--from", dest="start", type=int, default=1, metavar="N")
+    parser.add_argument("--to", dest="end", type=int, metavar="M")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.store)
+
+    if args.add:
+        n = store.commit(iter_unified(args.add), label=args.label or args.add.name)
+        build = store.builds()[-1]
+        print(f"Build {n}: {build['count']} languages, {build['changed']} changed, "
+              f"{build['removed']} removed, {build['objects']} new objects")
+        return
+
+    if (args.show or args.changes) and store.latest == 0:
+        sys.exit(f"No builds in {args.store}; store one with --add")
+
+    if args.show:
+        if args.as_of is not None and not 1 <= args.as_of <= store.latest:
+            parser.error(f"--as-of must be within 1..{store.latest}")
+        record = store.get(args.show, args.as_of)
+        if record is None:
+            sys.exit(f"{args.show} not found")
+        print(json.dumps(record, ensure_ascii=False, indent=2))
+        return
+
+    if args.changes:
+        end = store.latest if args.end is None else args.end
+        if not 1 <= args.start <= end <= store.latest:
+            parser.error(f"--from/--to must satisfy 1 <= N <= M <= {store.latest}")
+        for n, lang_id, old, new in store.field_changes(args.changes, args.start, end):
+            print(f"{n}\t{lang_id}\t{json.dumps(old, ensure_ascii=False)}\t{json.dumps(new, ensure_ascii=False)}")
+        return
+
+    for build in store.builds():
+        kind = "checkpoint" if build["checkpoint"] else "delta"
+        print(f"{build['n']}\t{build['created']}\t{build['count']} languages\t"
+              f"{build['changed']} changed\t{build['removed']} removed\t{kind}\t{build['label'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,23 +29,24 @@
 # SOFTWARE.
 #
 
-import json
-from pathlib import Path
 import re
+import sys
+from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 
 # Korjattu pattern: Script pakollinen, region valinnainen
 BCP47_PATTERN = re.compile(r"^[a-z]{2,3}-[A-Z][a-z]{3}(-([A-Z]{2}|\d{3}))?$")
 
 def validate_bcp47():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     errors = []
 
-    for lang_id, info in data.items():
+    for lang_id, info in iter_unified(UNIFIED):
         tag = info.get("bcp47")
         if not tag:
             continue
@@ -30,21 +30,25 @@
 #
 
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT_ERRORS = PROJECT_ROOT / "output" / "unified" / "fallback_errors.json"
 
 
 def validate_fallbacks():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Ketjujen tarkistus tarvitsee vain fallback-kentät, ei koko dataa
+    data = {lang_id: info.get("fallback") for lang_id, info in iter_unified(UNIFIED)}
 
     errors = []
 
-    for lang_id, info in data.items():
-        fb = info.get("fallback")
+    for lang_id, fb in data.items():
 
         if not fb:
             errors.append(f"{lang_id}: missing fallback")
@@ -64,7 +68,7 @@ def validate_fallbacks():
                 break
 
             visited.add(current)
-            next_fb = data[current].get("fallback")
+            next_fb = data[current]
 
             if not next_fb or next_fb == current:
                 break
@@ -30,9 +30,14 @@
 #
 
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT_ERRORS = PROJECT_ROOT / "output" / "unified" / "glottolog_errors.json"
 
@@ -48,12 +53,9 @@ VALID_MACROAREAS = {
 
 
 def validate_glottolog():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     errors = []
 
-    for lang_id, info in data.items():
+    for lang_id, info in iter_unified(UNIFIED):
         gl = info.get("glottolog", {})
 
         if not gl:
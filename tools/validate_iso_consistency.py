@@ -30,20 +30,22 @@
 #
 
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT_ERRORS = PROJECT_ROOT / "output" / "unified" / "iso_errors.json"
 
 
 def validate_iso():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     errors = []
 
-    for lang_id, info in data.items():
+    for lang_id, info in iter_unified(UNIFIED):
         iso1 = info.get("iso639_1", "")
         iso2B = info.get("iso639_2B", "")
         iso2T = info.get("iso639_2T", "")
@@ -30,20 +30,22 @@
 #
 
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT_ERRORS = PROJECT_ROOT / "output" / "unified" / "pos_stats_errors.json"
 
 
 def validate_pos_stats():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     errors = []
 
-    for lang_id, info in data.items():
+    for lang_id, info in iter_unified(UNIFIED):
         pos = info.get("pos_stats", {})
 
         if not pos:
@@ -29,10 +29,14 @@
 # SOFTWARE.
 #
 
-import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from loaders.load_unified import iter_unified
+
 UNIFIED = PROJECT_ROOT / "output" / "unified" / "unified_languages.json"
 OUTPUT = PROJECT_ROOT / "output" / "validation" / "fallback_graph.dot"
 
@@ -40,15 +44,12 @@ OUTPUT = PROJECT_ROOT / "output" / "validation" / "fallback_graph.dot"
 OUTPUT.parent.mkdir(parents=True, exist_ok=True)
 
 def visualize_fallbacks():
-    with open(UNIFIED, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     lines = []
     lines.append("digraph Fallbacks {")
     lines.append('  rankdir=LR;')
     lines.append('  node [shape=box, fontname="Arial"];')
 
-    for lang_id, info in data.items():
+    for lang_id, info in iter_unified(UNIFIED):
         fb = info.get("fallback")
 
         # Skip if no fallback
@@ -0,0 +1,4 @@
+# __init__.py
+__all__ = []  # Paketin julkiset moduulit
+__version__ = "1.0"
+
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GLFM Project
+# Copyright (c) 2026 Tuomas Lähteenmäki
+#
+# https://codeberg.org/lahtis/GLFM
+#
+# Licensed under the MIT License.
+# You may obtain a copy of the License at:
+# https://opensource.org/licenses/MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import tempfile
+from pathlib import Path
+
+from loaders.file_utils import DEFAULT_FILE_MODE
+
+# Pakkaus → binäärivirran kääre
+COMPRESSORS = {
+    None: lambda f: f,
+    "gz": lambda f: gzip.GzipFile(fileobj=f, mode="wb", mtime=0),
+    "xz": lambda f: lzma.LZMAFile(f, mode="wb"),
+}
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+INDEX_VERSION = 1
+
+
+def index_path_of(path):
+    """Sivutiedoston polku: unified_languages.json → unified_languages.json.offsets.json"""
+    path = Path(path)
+    return path.with_name(path.name + ".offsets.json")
+
+
+def compression_of(path):
+    """'gz' / 'xz' tiedostopäätteen perusteella, muuten None."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".gz", ".gzip"):
+        return "gz"
+    if suffix == ".xz":
+        return "xz"
+    return None
+
+
+def format_of(path):
+    """'ndjson' tai 'json' tiedostopäätteen perusteella (pakkauspääte ohitetaan)."""
+    path = Path(path)
+    if compression_of(path):
+        path = path.with_suffix("")
+    return "ndjson" if path.suffix.lower() in NDJSON_SUFFIXES else "json"
+
+
+class UnifiedWriter:
+    """
+    Kirjoittaa unified-tietueet yksi kerrallaan. Tiedosto kirjoitetaan
+    väliaikaistiedostoon samaan hakemistoon ja vaihdetaan paikalleen
+    os.replace():lla vasta onnistuneen sulkemisen jälkeen; keskeytynyt
+    kirjoitus ei koskaan jätä puolikasta tiedostoa.
+
+    index=True tallentaa lisäksi sivutiedoston (index_path_of), jossa on
+    jokaisen tietueen tavualue [alku, loppu) tiedostossa sekä tiedoston
+    sha256, jolla lukija varmistaa indeksin ajantasaisuuden. Pakatuille
+    tiedostoille indeksiä ei tehdä.
+
+        with PrettyJsonWriter(path) as writer:
+            writer.write("fin", record)
+    """
+
+    format = None
+
+    def __init__(self, path, compression=None, index=False):
+        self.path = Path(path)
+        self.compression = compression
+        self.index = index and compression is None
+        self.count = 0
+        self.offsets = {}
+        self._pos = 0
+        self._hash = hashlib.sha256()
+        self._f = None
+        self._raw = None
+        self._tmp = None
+
+    def __enter__(self):
+        if self.compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {self.compression}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self._raw = os.fdopen(fd, "wb")
+        self._f = COMPRESSORS[self.compression](self._raw)
+        self.begin()
+        return self
+
+    def _emit(self, text):
+        data = text.encode("utf-8")
+        self._f.write(data)
+        self._hash.update(data)
+        self._pos += len(data)
+
+    def _emit_record(self, key, text):
+        """Kirjoittaa tietueen JSON-tekstin ja kirjaa sen tavualueen."""
+        start = self._pos
+        self._emit(text)
+        if self.index:
+            self.offsets[key] = [start, self._pos]
+
+    def write(self, key, record):
+        self.write_record(key, record)
+        self.count += 1
+
+    def write_all(self, records):
+        """records = iteroitava (avain, tietue) -pareja tai dict."""
+        items = records.items() if isinstance(records, dict) else records
+        for key, record in items:
+            self.write(key, record)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.end()
+            if self._f is not self._raw:
+                self._f.close()
+            self._raw.close()
+            if exc_type is None:
+                os.chmod(self._tmp, DEFAULT_FILE_MODE)
+                os.replace(self._tmp, self.path)
+                if self.index:
+                    self._write_index()
+        finally:
+            if not self._raw.closed:
+                self._raw.close()
+            if os.path.exists(self._tmp):
+                os.unlink(self._tmp)
+        return False
+
+    def _write_index(self):
+        st = os.stat(self.path)
+        payload = {
+            "version": INDEX_VERSION,
+            "format": self.format,
+            "file": self.path.name,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": self._hash.hexdigest(),
+            "offsets": self.offsets,
+        }
+        target = index_path_of(self.path)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.chmod(tmp, DEFAULT_FILE_MODE)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    # --- Muotokohtaiset osat ---
+
+    def begin(self):
+        pass
+
+    def write_record(self, key, record):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+
+class PrettyJsonWriter(UnifiedWriter):
+    """Täsmälleen json.dump(..., ensure_ascii=False, indent=2) -muoto."""
+
+    format = "json"
+
+    def begin(self):
+        self._emit("{")
+
+    def write_record(self, key, record):
+        self._emit(("," if self.count else "") + "\n  " + json.dumps(key, ensure_ascii=False) + ": ")
+        self._emit_record(key, json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+
+    def end(self):
+        self._emit("\n}" if self.count else "}")
+
+
+class CompactJsonWriter(UnifiedWriter):
+    """Sama objekti ilman sisennyksiä ja välilyöntejä."""
+
+    format = "json"
+
+    def begin(self):
+        self._emit("{")
+
+    def write_record(self, key, record):
+        self._emit(("," if self.count else "") + json.dumps(key, ensure_ascii=False) + ":")
+        self._emit_record(key, json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+
+    def end(self):
+        self._emit("}")
+
+
+class NdjsonWriter(UnifiedWriter):
+    """
+    Yksi kieli per rivi. Rivi on tietue itse; "id"-kenttä lisätään
+    alkuun, jos se puuttuu (esim. projektiossa), jotta lukija tuntee avaimen.
+    """
+
+    format = "ndjson"
+
+    def write_record(self, key, record):
+        if record.get("id") != key:
+            record = {"id": key, **record}
+        self._emit_record(key, json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._emit("\n")
+
+
+WRITERS = {
+    "json": PrettyJsonWriter,
+    "compact": CompactJsonWriter,
+    "ndjson": NdjsonWriter,
+}
+
+
+def open_writer(path, format=None, compression=None, index=False):
+    """
+    Valitsee kirjoittimen. format/compression päätellään polusta, jos
+    niitä ei anneta: "x.ndjson.gz" → NDJSON + gzip.
+    """
+    format = format or format_of(path)
+    if format not in WRITERS:
+        raise ValueError(f"Unknown output format: {format}")
+    if compression is None:
+        compression = compression_of(path)
+    return WRITERS[format](path, compression, index)